@@ -0,0 +1,205 @@
+import threading
+import time
+
+# Ліміт росте, лише якщо у вікні його справді використали на стільки
+UTILIZATION = 0.8
+MIN_WINDOW = 10
+# Менше вибірок класу у вікні — p90 ненадійний, вони переходять у наступне
+MIN_CLASS_SAMPLES = 5
+CLASSES = ('cheap', 'expensive')
+
+
+class AdaptiveLimiter:
+    """Адаптивний ліміт одночасних запитів (AIMD за затримкою)
+
+    Після кожного вікна з max(10, ліміт) завершених запитів p90 затримки
+    кожного класу маршрутів (дешеві / дорогі) порівнюється з базовою цього
+    ж класу — найменшим його p90 серед усіх вікон. Окремі базові потрібні,
+    бо інакше зміна суміші маршрутів (більше дорогих запитів) виглядала б
+    як перевантаження. Якщо p90 якогось класу перевищує його базову в
+    tolerance разів або були відповіді 5xx, ліміт множиться на backoff. Якщо ж ліміт у вікні було майже вичерпано, він
+    зростає на одиницю. Так затримка прийнятих запитів тримається в межах
+    tolerance від ненавантаженої. Запити понад ліміт не чекають у черзі — їх
+    одразу відхиляють.
+
+    Якщо навіть на min_limit затримка завелика, базова класу вважається
+    застарілою (напр. БД стала повільнішою назавжди) і береться з вікна.
+
+    Дорогі запити не можуть займати останню частку cheap_reserve ліміту,
+    тож дешеві маршрути проходять і тоді, коли дорогі вже відсікаються.
+    """
+
+    def __init__(self, initial_limit=50, min_limit=10, max_limit=500, tolerance=2.0, backoff=0.9, cheap_reserve=0.2):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.cheap_reserve = cheap_reserve
+        self.in_flight = 0
+        self.peak = 0
+        self.samples = {kind: [] for kind in CLASSES}
+        self.window_failed = False
+        self.baselines = dict.fromkeys(CLASSES)
+        self.lock = threading.Lock()
+        self.counters = {'admitted': 0, 'shed_cheap': 0, 'shed_expensive': 0, 'decreases': 0, 'increases': 0}
+
+    def try_acquire(self, expensive=False):
+        """Зайняти місце; False — запит треба відхилити"""
+        with self.lock:
+            limit = int(self.limit)
+            if expensive:
+                limit -= max(1, int(limit * self.cheap_reserve))
+            if self.in_flight >= limit:
+                self.counters['shed_expensive' if expensive else 'shed_cheap'] += 1
+                return False
+
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.counters['admitted'] += 1
+            return True
+
+    def release(self, latency, failed=False, expensive=False):
+        """Звільнити місце й врахувати затримку (секунди) завершеного запиту"""
+        with self.lock:
+            self.in_flight -= 1
+            self.samples['expensive' if expensive else 'cheap'].append(latency)
+            self.window_failed = self.window_failed or failed
+            if sum(map(len, self.samples.values())) >= max(MIN_WINDOW, int(self.limit)):
+                self._adjust()
+
+    def _adjust(self):
+        slow = []
+        for kind, samples in self.samples.items():
+            if len(samples) < MIN_CLASS_SAMPLES:
+                continue
+            samples.sort()
+            observed = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+            if self.baselines[kind] is None or observed < self.baselines[kind]:
+                self.baselines[kind] = observed
+            if observed > self.baselines[kind] * self.tolerance:
+                slow.append((kind, observed))
+            self.samples[kind] = []
+
+        if self.window_failed or slow:
+            if self.limit <= self.min_limit and not self.window_failed:
+                for kind, observed in slow:
+                    self.baselines[kind] = observed
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self.counters['decreases'] += 1
+        elif self.peak >= int(self.limit) * UTILIZATION:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.counters['increases'] += 1
+
+        self.peak = self.in_flight
+        self.window_failed = False
+
+    def stats(self):
+        with self.lock:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'baseline_ms': {
+                    kind: round(baseline * 1000, 2) if baseline is not None else None
+                    for kind, baseline in self.baselines.items()
+                },
+                **self.counters
+            }
+
+
+def expensive_route(func):
+    """Дорогий обробник (хешування паролів, повні списки): першим відсікається при перевантаженні"""
+    func.admission = 'expensive'
+    return func
+
+
+def admission_exempt(func):
+    """Обробник поза контролем навантаження (моніторинг, довгі стріми)"""
+    func.admission = 'exempt'
+    return func
+
+
+def route_class(handler):
+    return getattr(handler, 'admission', 'cheap')
+
+
+class AdmissionControl:
+    """Контроль навантаження для API-маршрутів Flask (/api/...)
+
+    Кожен процес має власний AdaptiveLimiter. Запит понад ліміт отримує
+    503 з Retry-After ще до виконання обробника.
+    """
+
+    def __init__(self, app=None):
+        self.limiter = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config['ADMISSION_ENABLED']:
+            return
+
+        # Flask імпортуємо тут: модуль використовує й aiohttp-сервер
+        from flask import g, jsonify, request, current_app
+
+        limiter = self.limiter = limiter_from_config(app.config)
+        retry_after = str(app.config['ADMISSION_RETRY_AFTER'])
+
+        def handler():
+            """Функція, що обслужить запит (для Flask-RESTful — метод ресурсу)"""
+            view = current_app.view_functions.get(request.endpoint)
+            view_class = getattr(view, 'view_class', None)
+            if view_class is not None:
+                return getattr(view_class, request.method.lower(), None)
+            return view
+
+        @app.before_request
+        def admit():
+            if not request.path.startswith('/api/') or request.endpoint is None:
+                return None
+
+            kind = route_class(handler())
+            if kind == 'exempt':
+                return None
+            if not limiter.try_acquire(kind == 'expensive'):
+                response = jsonify({'message': 'Сервер перевантажений, спробуйте пізніше'})
+                response.status_code = 503
+                response.headers['Retry-After'] = retry_after
+                return response
+
+            g.admitted_at = time.perf_counter()
+            g.admission_expensive = kind == 'expensive'
+            return None
+
+        @app.after_request
+        def record_status(response):
+            if 'admitted_at' in g:
+                g.admission_failed = response.status_code >= 500
+            return response
+
+        @app.teardown_request
+        def release(exc):
+            started = g.pop('admitted_at', None)
+            if started is not None:
+                failed = exc is not None or g.get('admission_failed', False)
+                limiter.release(time.perf_counter() - started, failed, g.get('admission_expensive', False))
+
+    def stats(self):
+        return self.limiter.stats() if self.limiter is not None else None
+
+
+def limiter_from_config(config):
+    """AdaptiveLimiter з параметрами ADMISSION_* (Flask app.config або Config)"""
+    get = config.get if isinstance(config, dict) else lambda name: getattr(config, name)
+    return AdaptiveLimiter(
+        initial_limit=get('ADMISSION_INITIAL_LIMIT'),
+        min_limit=get('ADMISSION_MIN_LIMIT'),
+        max_limit=get('ADMISSION_MAX_LIMIT'),
+        tolerance=get('ADMISSION_LATENCY_TOLERANCE'),
+        backoff=get('ADMISSION_BACKOFF'),
+        cheap_reserve=get('ADMISSION_CHEAP_RESERVE')
+    )
+
+
+admission_control = AdmissionControl()
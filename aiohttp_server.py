@@ -1,30 +1,154 @@
 import asyncio
 import aiohttp
-from aiohttp import web, ClientSession
+from aiohttp import web
 import aiohttp_cors
-import json
 import aiomysql
+import jwt
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from config import Config
+from conditional import make_etag, is_not_modified, validator_headers
+from sql_timing import start_request, current_timings, TimedCursor
+from json_codec import json_codec
+from comment_writer import CommentWriter, CommentQueueFull, PostNotFound
+from comment_feed import CommentFeed, RESET, format_event
+from single_flight import SingleFlight, request_key
+from news_client import NewsClient, CircuitBreaker, CircuitOpen, UpstreamError
+from admission import limiter_from_config, expensive_route, admission_exempt, route_class
+
+# Гарячі запити винесені на рівень модуля, щоб flask explain-check перевіряв саме їх.
+# Лічильники — корельовані підзапити замість JOIN + GROUP BY: список читається
+# по індексу created_at без тимчасової таблиці та filesort.
+POSTS_QUERY = """
+    SELECT p.id, p.title, p.content, p.created_at,
+           u.username as author_name,
+           (SELECT COUNT(*) FROM comment c WHERE c.post_id = p.id) as comments_count
+    FROM post p
+    LEFT JOIN user u ON p.user_id = u.id
+    ORDER BY p.created_at DESC
+"""
+
+# Валідатори списку: рядок list_version за ключем і MAX по ix_post_updated_at
+POSTS_VALIDATORS_QUERY = """
+    SELECT (SELECT version FROM list_version WHERE name = 'posts') as version,
+           (SELECT updated_at FROM list_version WHERE name = 'posts') as changed_at,
+           (SELECT MAX(updated_at) FROM post) as last_updated
+"""
+
+POST_QUERY = """
+    SELECT p.id, p.title, p.content, p.created_at, p.updated_at, p.version,
+           u.username as author_name
+    FROM post p
+    LEFT JOIN user u ON p.user_id = u.id
+    WHERE p.id = %s
+"""
+
+POST_COMMENTS_QUERY = """
+    SELECT c.id, c.content, c.created_at,
+           u.username as author_name
+    FROM comment c
+    LEFT JOIN user u ON c.user_id = u.id
+    WHERE c.post_id = %s
+    ORDER BY c.created_at DESC
+"""
+
+USERS_QUERY = """
+    SELECT u.id, u.username, u.email, u.is_admin, u.created_at,
+           (SELECT COUNT(*) FROM post p WHERE p.user_id = u.id) as posts_count
+    FROM user u
+    ORDER BY u.created_at DESC
+"""
+
+
+def json_response(data, status=200, headers=None):
+    """JSON-відповідь через json_codec (datetime серіалізуються без ручного isoformat)
+
+    bytes вважаються вже серіалізованим тілом (напр. спільним з SingleFlight).
+    """
+    body = data if isinstance(data, bytes) else json_codec.dumps(data)
+    return web.Response(body=body, status=status, headers=headers, content_type='application/json')
 
 
 class AsyncBlogAPI:
-    def __init__(self):
-        self.app = web.Application()
+    def __init__(self, db_config=None, pool_config=None, pool_factory=None):
+        middlewares = []
+        if Config.ADMISSION_ENABLED:
+            # Першим: відхилений запит не має коштувати нічого
+            self.limiter = limiter_from_config(Config)
+            middlewares.append(self.admission_middleware)
+        else:
+            self.limiter = None
+        if Config.SQL_TIMING_ENABLED:
+            middlewares.append(self.sql_timing_middleware)
+        self.app = web.Application(middlewares=middlewares)
+        json_codec.configure(Config.JSON_BACKEND)
         self.setup_routes()
         self.setup_cors()
-        self.db_config = {
-            'host': 'localhost',
-            'user': 'admin',
-            'password': '1234567890',
-            'database': 'flask_crud'
+        self.db_config = db_config or {
+            'host': Config.MYSQL_HOST,
+            'port': Config.MYSQL_PORT,
+            'user': Config.MYSQL_USER,
+            'password': Config.MYSQL_PASSWORD,
+            'database': Config.MYSQL_DB
         }
+        self.pool_config = {
+            'minsize': Config.ASYNC_DB_POOL_MINSIZE,
+            'maxsize': Config.ASYNC_DB_POOL_MAXSIZE,
+            'acquire_timeout': Config.ASYNC_DB_ACQUIRE_TIMEOUT,
+            'pool_recycle': Config.ASYNC_DB_POOL_RECYCLE,
+            **(pool_config or {})
+        }
+        # Фабрика пулу з інтерфейсом aiomysql.create_pool (можна підмінити в тестах)
+        self.pool_factory = pool_factory or aiomysql.create_pool
+        self.pool = None
+        self.pool_stats = {'acquired': 0, 'timeouts': 0}
+        # Однакові одночасні GET до постів виконуються один раз
+        self.single_flight = SingleFlight(cache_ms=Config.COALESCE_CACHE_MS)
+        self.comment_feed = CommentFeed(
+            self.db_cursor,
+            json_codec.dumps,
+            poll_ms=Config.COMMENT_FEED_POLL_MS,
+            buffer_size=Config.COMMENT_FEED_CLIENT_BUFFER,
+            history_size=Config.COMMENT_FEED_HISTORY
+        )
+        self.comment_writer = CommentWriter(
+            self.db_transaction,
+            queue_size=Config.COMMENT_QUEUE_SIZE,
+            batch_size=Config.COMMENT_BATCH_SIZE,
+            flush_ms=Config.COMMENT_FLUSH_MS,
+            # Свої коментарі з'являються в стрімі одразу, без очікування тіку
+            on_commit=self.comment_feed.notify
+        )
+
+        self.news_client = NewsClient(
+            Config.NEWS_API_URL,
+            limit=Config.NEWS_LIMIT,
+            ttl=Config.NEWS_CACHE_TTL,
+            stale_ttl=Config.NEWS_STALE_TTL,
+            timeout=Config.NEWS_TIMEOUT,
+            max_connections=Config.NEWS_MAX_CONNECTIONS,
+            breaker=CircuitBreaker(Config.NEWS_BREAKER_FAILURES, Config.NEWS_BREAKER_RESET)
+        )
+
+        # Пул, писач, потік коментарів і HTTP-клієнт живуть разом із додатком
+        self.app.on_startup.append(self.create_pool)
+        self.app.on_startup.append(self.comment_writer.start)
+        self.app.on_startup.append(self.news_client.start)
+        self.app.on_shutdown.append(self.comment_writer.stop)
+        self.app.on_shutdown.append(self.comment_feed.close)
+        self.app.on_cleanup.append(self.news_client.close)
+        self.app.on_cleanup.append(self.close_pool)
 
     def setup_routes(self):
         """Налаштування маршрутів"""
         self.app.router.add_get('/api/async/posts', self.get_posts)
         self.app.router.add_get('/api/async/posts/{post_id}', self.get_post)
+        self.app.router.add_post(r'/api/async/posts/{post_id:\d+}/comments', self.create_comment)
+        self.app.router.add_get(r'/api/async/posts/{post_id:\d+}/stream', self.stream_comments)
         self.app.router.add_get('/api/async/users', self.get_users)
         self.app.router.add_get('/api/async/external/news', self.get_external_news)
+        self.app.router.add_get('/api/async/pool/stats', self.get_pool_stats)
 
     def setup_cors(self):
         """Налаштування CORS"""
@@ -40,185 +164,383 @@ class AsyncBlogAPI:
         for route in list(self.app.router.routes()):
             cors.add(route)
 
-    async def get_db_connection(self):
-        """Отримати з'єднання з БД"""
-        return await aiomysql.connect(
+    async def create_pool(self, app):
+        """Створити пул з'єднань при старті"""
+        self.pool = await self.pool_factory(
+            minsize=self.pool_config['minsize'],
+            maxsize=self.pool_config['maxsize'],
+            pool_recycle=self.pool_config['pool_recycle'],
             host=self.db_config['host'],
+            port=self.db_config.get('port', 3306),
             user=self.db_config['user'],
             password=self.db_config['password'],
             db=self.db_config['database'],
             autocommit=True
         )
 
-    async def get_posts(self, request):
-        """Отримати всі пости асинхронно"""
+    async def close_pool(self, app):
+        """Закрити пул з'єднань при зупинці"""
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    @asynccontextmanager
+    async def db_connection(self):
+        """Взяти з'єднання з пулу (asyncio.TimeoutError, якщо пул зайнятий)"""
         try:
-            conn = await self.get_db_connection()
-            cursor = await conn.cursor(dictionary=True)
-
-            query = """
-                SELECT p.id, p.title, p.content, p.created_at, 
-                       u.username as author_name,
-                       COUNT(c.id) as comments_count
-                FROM post p
-                LEFT JOIN user u ON p.user_id = u.id
-                LEFT JOIN comment c ON p.id = c.post_id
-                GROUP BY p.id
-                ORDER BY p.created_at DESC
-            """
-
-            await cursor.execute(query)
-            posts = await cursor.fetchall()
+            conn = await asyncio.wait_for(self.pool.acquire(), self.pool_config['acquire_timeout'])
+        except asyncio.TimeoutError:
+            self.pool_stats['timeouts'] += 1
+            raise
 
-            # Конвертація datetime в string
-            for post in posts:
-                if post['created_at']:
-                    post['created_at'] = post['created_at'].isoformat()
+        self.pool_stats['acquired'] += 1
+        try:
+            yield conn
+        finally:
+            # Повертаємо з'єднання навіть якщо обробник впав
+            self.pool.release(conn)
+
+    @asynccontextmanager
+    async def db_cursor(self):
+        """Взяти з'єднання з пулу та відкрити dict-курсор"""
+        async with self.db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                timings = current_timings.get()
+                yield TimedCursor(cursor, timings) if timings is not None else cursor
+
+    @asynccontextmanager
+    async def db_transaction(self):
+        """Dict-курсор у явній транзакції: commit після блоку, rollback при помилці"""
+        async with self.db_connection() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    yield cursor
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    def authenticate(self, request):
+        """id користувача з Bearer-токена Flask-JWT-Extended або None"""
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return None
 
-            await cursor.close()
-            await conn.close()
+        try:
+            claims = jwt.decode(header[len('Bearer '):], Config.JWT_SECRET_KEY, algorithms=['HS256'])
+        except jwt.PyJWTError:
+            return None
 
-            return web.json_response({
-                'success': True,
-                'posts': posts,
-                'count': len(posts)
-            })
+        return claims.get('sub') if claims.get('type') == 'access' else None
+
+    @web.middleware
+    async def sql_timing_middleware(self, request, handler):
+        """Server-Timing та лог повільних запитів (SQL_TIMING_ENABLED)"""
+        timings = start_request(Config.SQL_SLOW_QUERY_MS, request.path)
+        try:
+            response = await handler(request)
+        finally:
+            current_timings.set(None)
+        response.headers['Server-Timing'] = timings.server_timing()
+        return response
+
+    @web.middleware
+    async def admission_middleware(self, request, handler):
+        """Адаптивний ліміт одночасних запитів: понад нього — одразу 503"""
+        kind = route_class(request.match_info.handler)
+        if kind == 'exempt' or not request.path.startswith('/api/'):
+            return await handler(request)
+
+        if not self.limiter.try_acquire(kind == 'expensive'):
+            return json_response({
+                'success': False,
+                'error': 'Сервер перевантажений, спробуйте пізніше'
+            }, status=503, headers={'Retry-After': str(Config.ADMISSION_RETRY_AFTER)})
 
+        started = time.perf_counter()
+        # Скасування (клієнт не дочекався) теж сигнал перевантаження
+        failed = True
+        try:
+            response = await handler(request)
+            failed = response.status >= 500
+            return response
+        except web.HTTPException as e:
+            failed = e.status >= 500
+            raise
+        finally:
+            self.limiter.release(time.perf_counter() - started, failed, kind == 'expensive')
+
+    def not_modified_response(self, etag, last_modified=None):
+        """Порожня відповідь 304 з валідаторами"""
+        return web.Response(status=304, headers=validator_headers(etag, last_modified))
+
+    def pool_timeout_response(self):
+        """Відповідь, коли всі з'єднання пулу зайняті"""
+        return json_response({
+            'success': False,
+            'error': 'База даних перевантажена, спробуйте пізніше'
+        }, status=503)
+
+    @expensive_route
+    async def get_posts(self, request):
+        """Отримати всі пости асинхронно"""
+        key = request_key(request)
+        try:
+            # Валідатори дешевші за повний список — перевіряємо їх першими
+            validators = await self.single_flight.run(key + ('validators',), self.load_posts_validators)
+            etag = make_etag('async-posts', validators['version'], validators['last_modified'])
+            if is_not_modified(request.headers, etag, validators['last_modified']):
+                return self.not_modified_response(etag, validators['last_modified'])
+
+            # Тіло прив'язане до ETag: об'єднуються лише запити до тієї самої версії
+            body = await self.single_flight.run(key + (etag,), self.load_posts_body)
+            return json_response(body, headers=validator_headers(etag, validators['last_modified']))
+
+        except asyncio.TimeoutError:
+            return self.pool_timeout_response()
         except Exception as e:
-            return web.json_response({
+            return json_response({
                 'success': False,
                 'error': str(e)
             }, status=500)
 
+    async def load_posts_validators(self):
+        """Версія списку та остання зміна (див. Post.list_validators) — без COUNT по таблиці"""
+        async with self.db_cursor() as cursor:
+            await cursor.execute(POSTS_VALIDATORS_QUERY)
+            validators = await cursor.fetchone()
+        changes = [value for value in (validators['changed_at'], validators['last_updated']) if value is not None]
+        return {'version': validators['version'], 'last_modified': max(changes, default=None)}
+
+    async def load_posts_body(self):
+        """Серіалізований список постів (спільний для об'єднаних запитів)"""
+        async with self.db_cursor() as cursor:
+            await cursor.execute(POSTS_QUERY)
+            posts = await cursor.fetchall()
+
+        return json_codec.dumps({
+            'success': True,
+            'posts': posts,
+            'count': len(posts)
+        })
+
     async def get_post(self, request):
         """Отримати конкретний пост з коментарями"""
         post_id = request.match_info['post_id']
+        key = request_key(request)
 
         try:
-            conn = await self.get_db_connection()
-            cursor = await conn.cursor(dictionary=True)
-
-            # Отримуємо пост
-            post_query = """
-                SELECT p.id, p.title, p.content, p.created_at, 
-                       u.username as author_name
-                FROM post p
-                LEFT JOIN user u ON p.user_id = u.id
-                WHERE p.id = %s
-            """
-
-            await cursor.execute(post_query, (post_id,))
-            post = await cursor.fetchone()
-
+            post = await self.single_flight.run(key + ('post',), lambda: self.load_post(post_id))
             if not post:
-                return web.json_response({
+                return json_response({
                     'success': False,
                     'error': 'Пост не знайдено'
                 }, status=404)
 
-            # Отримуємо коментарі
-            comments_query = """
-                SELECT c.id, c.content, c.created_at,
-                       u.username as author_name
-                FROM comment c
-                LEFT JOIN user u ON c.user_id = u.id
-                WHERE c.post_id = %s
-                ORDER BY c.created_at DESC
-            """
-
-            await cursor.execute(comments_query, (post_id,))
-            comments = await cursor.fetchall()
+            # Коментарі не читаємо, якщо клієнт має актуальну версію
+            last_modified = post['updated_at']
+            etag = make_etag('async-post', post['id'], post['version'], last_modified)
+            if is_not_modified(request.headers, etag, last_modified):
+                return self.not_modified_response(etag, last_modified)
 
-            # Конвертація datetime
-            post['created_at'] = post['created_at'].isoformat()
-            for comment in comments:
-                comment['created_at'] = comment['created_at'].isoformat()
+            body = await self.single_flight.run(key + (etag,), lambda: self.load_post_body(post))
+            return json_response(body, headers=validator_headers(etag, last_modified))
 
-            post['comments'] = comments
+        except asyncio.TimeoutError:
+            return self.pool_timeout_response()
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, status=500)
 
-            await cursor.close()
-            await conn.close()
+    async def load_post(self, post_id):
+        async with self.db_cursor() as cursor:
+            await cursor.execute(POST_QUERY, (post_id,))
+            return await cursor.fetchone()
 
-            return web.json_response({
-                'success': True,
-                'post': post
-            })
+    async def load_post_body(self, post):
+        """Серіалізований пост з коментарями (спільний для об'єднаних запитів)"""
+        async with self.db_cursor() as cursor:
+            await cursor.execute(POST_COMMENTS_QUERY, (post['id'],))
+            comments = await cursor.fetchall()
+
+        # Рядок поста спільний для всіх запитів — не змінюємо його на місці
+        fields = {name: value for name, value in post.items() if name not in ('updated_at', 'version')}
+        return json_codec.dumps({
+            'success': True,
+            'post': {**fields, 'comments': comments}
+        })
 
+    async def create_comment(self, request):
+        """Додати коментар через групову фіксацію (відповідь — після commit пакета)"""
+        user_id = self.authenticate(request)
+        if user_id is None:
+            return json_response({'success': False, 'error': 'Потрібна авторизація'}, status=401)
+
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        content = data.get('content') if isinstance(data, dict) else None
+        if not isinstance(content, str) or not content.strip():
+            return json_response({'success': False, 'error': 'Зміст коментаря обов\'язковий'}, status=400)
+        if len(content) > 500:
+            return json_response({'success': False, 'error': 'Коментар має містити від 1 до 500 символів'}, status=400)
+
+        post_id = int(request.match_info['post_id'])
+        try:
+            comment_id, batch_size = await self.comment_writer.submit(post_id, user_id, content)
+        except CommentQueueFull:
+            return json_response({
+                'success': False,
+                'error': 'Забагато коментарів, спробуйте пізніше'
+            }, status=503, headers={'Retry-After': str(Config.COMMENT_RETRY_AFTER)})
+        except PostNotFound:
+            return json_response({'success': False, 'error': 'Пост не знайдено'}, status=404)
+        except asyncio.TimeoutError:
+            return self.pool_timeout_response()
         except Exception as e:
-            return web.json_response({
+            return json_response({
                 'success': False,
                 'error': str(e)
             }, status=500)
 
+        return json_response({
+            'success': True,
+            'comment': {'post_id': post_id, 'user_id': user_id, 'content': content},
+            'comment_id': comment_id,
+            'batch_size': batch_size
+        }, status=201)
+
+    @admission_exempt
+    async def stream_comments(self, request):
+        """Нові коментарі поста як Server-Sent Events
+
+        Курсор — заголовок Last-Event-ID (перепідключення EventSource) або
+        ?after=<id останнього показаного коментаря>.
+        """
+        post_id = int(request.match_info['post_id'])
+        after = request.headers.get('Last-Event-ID') or request.query.get('after')
+        try:
+            after = int(after) if after is not None else None
+        except ValueError:
+            return json_response({'success': False, 'error': 'Курсор має бути числом'}, status=400)
+
+        try:
+            subscription = await self.comment_feed.subscribe(post_id, after)
+        except PostNotFound:
+            return json_response({'success': False, 'error': 'Пост не знайдено'}, status=404)
+        except asyncio.TimeoutError:
+            return self.pool_timeout_response()
+
+        try:
+            response = web.StreamResponse(headers={
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                # Проксі (nginx) не повинен буферизувати стрім
+                'X-Accel-Buffering': 'no'
+            })
+            await response.prepare(request)
+            await response.write(b'retry: %d\n\n' % Config.COMMENT_FEED_RETRY_MS)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), Config.COMMENT_FEED_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    # Коментар-пінг тримає з'єднання крізь проксі та виявляє відключених
+                    await response.write(b': ping\n\n')
+                    continue
+
+                if event is RESET:
+                    await response.write(b'event: reset\ndata: {}\n\n')
+                    break
+                await response.write(format_event(event))
+        except ConnectionResetError:
+            pass
+        finally:
+            self.comment_feed.unsubscribe(subscription)
+
+        return response
+
+    @expensive_route
     async def get_users(self, request):
         """Отримати список користувачів"""
         try:
-            conn = await self.get_db_connection()
-            cursor = await conn.cursor(dictionary=True)
-
-            query = """
-                SELECT u.id, u.username, u.email, u.is_admin, u.created_at,
-                       COUNT(p.id) as posts_count
-                FROM user u
-                LEFT JOIN post p ON u.id = p.user_id
-                GROUP BY u.id
-                ORDER BY u.created_at DESC
-            """
-
-            await cursor.execute(query)
-            users = await cursor.fetchall()
-
-            # Конвертація datetime та bool
+            async with self.db_cursor() as cursor:
+                await cursor.execute(USERS_QUERY)
+                users = await cursor.fetchall()
+
+            # MySQL повертає BOOLEAN як TINYINT
             for user in users:
-                user['created_at'] = user['created_at'].isoformat()
                 user['is_admin'] = bool(user['is_admin'])
 
-            await cursor.close()
-            await conn.close()
-
-            return web.json_response({
+            return json_response({
                 'success': True,
                 'users': users,
                 'count': len(users)
             })
 
+        except asyncio.TimeoutError:
+            return self.pool_timeout_response()
         except Exception as e:
-            return web.json_response({
+            return json_response({
                 'success': False,
                 'error': str(e)
             }, status=500)
 
+    @admission_exempt
+    async def get_pool_stats(self, request):
+        """Статистика пулу з'єднань"""
+        if self.pool is None:
+            return json_response({
+                'success': False,
+                'error': 'Пул не ініціалізовано'
+            }, status=503)
+
+        return json_response({
+            'success': True,
+            'pool': {
+                'size': self.pool.size,
+                'free': self.pool.freesize,
+                'used': self.pool.size - self.pool.freesize,
+                'minsize': self.pool.minsize,
+                'maxsize': self.pool.maxsize,
+                **self.pool_stats
+            },
+            'comments': {
+                'queue': self.comment_writer.queue.qsize(),
+                **self.comment_writer.stats
+            },
+            'feed': self.comment_feed.snapshot(),
+            'coalescing': self.single_flight.snapshot(),
+            'news': self.news_client.snapshot(),
+            'admission': self.limiter.stats() if self.limiter is not None else None
+        })
+
     async def get_external_news(self, request):
-        """Приклад роботи з зовнішнім API"""
+        """Приклад роботи з зовнішнім API (кеш зі stale-while-revalidate)"""
         try:
-            async with ClientSession() as session:
-                # Приклад запиту до зовнішнього API
-                url = 'https://jsonplaceholder.typicode.com/posts'
-
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Беремо тільки перші 5 постів
-                        limited_data = data[:5]
-
-                        return web.json_response({
-                            'success': True,
-                            'external_posts': limited_data,
-                            'source': 'JSONPlaceholder API'
-                        })
-                    else:
-                        return web.json_response({
-                            'success': False,
-                            'error': 'Помилка при отриманні даних'
-                        }, status=500)
-
-        except Exception as e:
-            return web.json_response({
+            posts, stale = await self.news_client.get()
+        except CircuitOpen as e:
+            return json_response({
                 'success': False,
                 'error': str(e)
-            }, status=500)
-
+            }, status=503, headers={'Retry-After': str(e.retry_after)})
+        except UpstreamError as e:
+            return json_response({
+                'success': False,
+                'error': f'Помилка при отриманні даних: {e}'
+            }, status=502)
+
+        return json_response({
+            'success': True,
+            'external_posts': posts,
+            'source': 'JSONPlaceholder API',
+            'stale': stale
+        })
 
 async def init_app():
     """Ініціалізація додатку"""
@@ -240,8 +562,11 @@ async def main():
     print("Доступні endpoints:")
     print("- GET /api/async/posts - всі пости")
     print("- GET /api/async/posts/{id} - конкретний пост")
+    print("- POST /api/async/posts/{id}/comments - новий коментар (JWT)")
+    print("- GET /api/async/posts/{id}/stream - нові коментарі (Server-Sent Events)")
     print("- GET /api/async/users - всі користувачі")
     print("- GET /api/async/external/news - зовнішній API")
+    print("- GET /api/async/pool/stats - статистика пулу з'єднань")
 
     # Тримаємо сервер запущеним
     try:
@@ -1,11 +1,92 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app, Response
 from flask_restful import Api, Resource
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
-from models import User, Post, Comment, db
+from models import User, Post, Comment, ListVersion, db, make_excerpt
+from pagination import paginate_keyset, parse_limit, InvalidCursor
+from query_budget import query_budget
+from replicas import replica_router, replica_reads
+from admission import admission_control, expensive_route, admission_exempt
+from conditional import make_etag, is_not_modified, validator_headers
+from search import search_index
+from identity import current_identity, identity_cache, identity_claims
+from fragment_cache import fragment_cache, invalidate_post
+from counters import count_cache
+from json_codec import json_codec, output_json
+from fieldsets import (
+    POST_FIELDS, POST_LIST_FIELDS, POST_INCLUDES, InvalidFieldset, parse_fieldset, post_query, serialize_post
+)
+from time import perf_counter
 from datetime import timedelta
 
 
+def not_modified_response(etag, last_modified=None):
+    """Порожня відповідь 304 з валідаторами"""
+    return Response(status=304, headers=validator_headers(etag, last_modified))
+
+
+def requested_fieldset(default_fields, default_include=()):
+    """Розібрати ?fields= та ?include= (InvalidFieldset при невідомих значеннях)"""
+    fields = parse_fieldset(request.args.get('fields'), POST_FIELDS, default_fields)
+    include = parse_fieldset(request.args.get('include'), POST_INCLUDES, default_include)
+    return fields, include
+
+
+def bulk_items(key):
+    """Дістати масив елементів з тіла bulk-запиту"""
+    data = request.get_json(silent=True) or {}
+    items = data.get(key) if isinstance(data, dict) else None
+
+    if not isinstance(items, list) or not items:
+        return None, ({'message': f'Очікується непорожній масив {key}'}, 400)
+
+    limit = current_app.config['BULK_MAX_ITEMS']
+    if len(items) > limit:
+        return None, ({'message': f'Не більше {limit} елементів за запит'}, 400)
+
+    return items, None
+
+
+def is_id(value):
+    """Цілий id з JSON (true/false — теж int у Python, але не id)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def bulk_insert(model, rows):
+    """Пакетний INSERT; повертає id рядків у порядку rows (None, якщо СУБД їх не віддає)"""
+    table = model.__table__
+    if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = db.insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return db.session.execute(statement, rows).scalars().all()
+
+    if db.engine.dialect.name in ('mysql', 'mariadb'):
+        # MySQL не має RETURNING: один багаторядковий INSERT, lastrowid — id його першого рядка.
+        # Id одного такого INSERT ідуть поспіль, тож пакет займає рівно first_id .. first_id + n - 1
+        result = db.session.execute(db.insert(table).values(rows))
+        if result.rowcount == len(rows):
+            first_id = result.lastrowid
+            ids = db.session.execute(
+                db.select(table.c.id)
+                .where(table.c.id.between(first_id, first_id + len(rows) - 1))
+                .order_by(table.c.id)
+            ).scalars().all()
+            if len(ids) == len(rows):
+                return ids
+
+        return [None] * len(rows)
+
+    db.session.execute(db.insert(table), rows)
+    return [None] * len(rows)
+
+
+def bulk_status(results, written):
+    """201 — усе записано, 207 — частково, 400 — нічого"""
+    if not written:
+        return 400
+    return 201 if written == len(results) else 207
+
+
 class AuthAPI(Resource):
+    @expensive_route
     def post(self):
         """Авторизація через API"""
         data = request.get_json()
@@ -18,8 +99,11 @@ class AuthAPI(Resource):
         user = User.query.filter_by(email=email).first()
 
         if user and user.check_password(password):
+            # Зберегти перерахований хеш, якщо метод змінився
+            db.session.commit()
             access_token = create_access_token(
                 identity=user.id,
+                additional_claims=identity_claims(user),
                 expires_delta=timedelta(days=7)
             )
             return {
@@ -36,16 +120,27 @@ class AuthAPI(Resource):
 
 
 class UserListAPI(Resource):
+    @expensive_route
     @jwt_required()
     def get(self):
         """Отримати список користувачів"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
 
         if not current_user.is_admin:
             return {'message': 'Доступ заборонений'}, 403
 
-        users = User.query.all()
+        limit = parse_limit(
+            request.args.get('limit'),
+            current_app.config['USERS_PER_PAGE'],
+            current_app.config['USERS_MAX_PER_PAGE']
+        )
+
+        try:
+            users, next_cursor = paginate_keyset(User.query, User, request.args.get('cursor'), limit)
+        except InvalidCursor as e:
+            return {'message': str(e)}, 400
+
         return {
             'users': [{
                 'id': user.id,
@@ -53,14 +148,16 @@ class UserListAPI(Resource):
                 'email': user.email,
                 'is_admin': user.is_admin,
                 'created_at': user.created_at.isoformat()
-            } for user in users]
+            } for user in users],
+            'next_cursor': next_cursor
         }, 200
 
+    @expensive_route
     @jwt_required()
     def post(self):
         """Створити нового користувача"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
 
         if not current_user.is_admin:
             return {'message': 'Доступ заборонений'}, 403
@@ -81,6 +178,7 @@ class UserListAPI(Resource):
         user.set_password(password)
         db.session.add(user)
         db.session.commit()
+        count_cache.invalidate('users')
 
         return {'message': 'Користувача створено', 'user_id': user.id}, 201
 
@@ -90,19 +188,25 @@ class UserAPI(Resource):
     def get(self, user_id):
         """Отримати інформацію про користувача"""
         user = User.query.get_or_404(user_id)
+
+        etag = make_etag('user', user.id, user.updated_at)
+        if is_not_modified(request.headers, etag, user.updated_at):
+            return not_modified_response(etag, user.updated_at)
+
         return {
             'id': user.id,
             'username': user.username,
             'email': user.email,
             'is_admin': user.is_admin,
             'created_at': user.created_at.isoformat()
-        }, 200
+        }, 200, validator_headers(etag, user.updated_at)
 
+    @expensive_route
     @jwt_required()
     def put(self, user_id):
         """Оновити користувача"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
 
         if user_id != current_user_id and not current_user.is_admin:
             return {'message': 'Доступ заборонений'}, 403
@@ -110,6 +214,7 @@ class UserAPI(Resource):
         user = User.query.get_or_404(user_id)
         data = request.get_json()
 
+        renamed = data.get('username', user.username) != user.username
         user.username = data.get('username', user.username)
         user.email = data.get('email', user.email)
 
@@ -119,14 +224,22 @@ class UserAPI(Resource):
         if data.get('password'):
             user.set_password(data['password'])
 
+        # Ім'я автора вбудоване в пости та список — їхні валідатори мають змінитися
+        touched = Post.touch_by_user(user_id) if renamed else []
+        if renamed:
+            ListVersion.bump('posts')
+
         db.session.commit()
+        identity_cache.invalidate(user_id)
+        for post_id in touched:
+            invalidate_post(post_id)
         return {'message': 'Користувача оновлено'}, 200
 
     @jwt_required()
     def delete(self, user_id):
         """Видалити користувача"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
 
         if not current_user.is_admin:
             return {'message': 'Доступ заборонений'}, 403
@@ -135,25 +248,54 @@ class UserAPI(Resource):
             return {'message': 'Не можна видалити себе'}, 400
 
         user = User.query.get_or_404(user_id)
+        # Разом з користувачем зникають його пости та коментарі під чужими постами
+        own = [row.id for row in db.session.query(Post.id).filter_by(user_id=user_id)]
+        touched = Post.touch_by_user(user_id)
+        ListVersion.bump('posts')
         db.session.delete(user)
         db.session.commit()
+        identity_cache.invalidate(user_id)
+        count_cache.invalidate('users')
+        for post_id in own:
+            search_index.remove_post(post_id)
+        for post_id in touched:
+            invalidate_post(post_id)
         return {'message': 'Користувача видалено'}, 200
 
 
 class PostListAPI(Resource):
+    @expensive_route
+    @replica_reads
+    @query_budget(3)
     def get(self):
-        """Отримати список постів"""
-        posts = Post.query.order_by(Post.created_at.desc()).all()
+        """Отримати список постів (keyset-пагінація, ?fields=, ?include=)"""
+        limit = parse_limit(
+            request.args.get('limit'),
+            current_app.config['POSTS_PER_PAGE'],
+            current_app.config['POSTS_MAX_PER_PAGE']
+        )
+        cursor = request.args.get('cursor')
+
+        try:
+            fields, include = requested_fieldset(POST_LIST_FIELDS)
+        except InvalidFieldset as e:
+            return {'message': str(e)}, 400
+
+        # Дешева перевірка валідаторів до завантаження та серіалізації сторінки
+        version, last_modified = Post.list_validators()
+        etag = make_etag('posts', version, last_modified, cursor, limit, fields, include)
+        if is_not_modified(request.headers, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        try:
+            posts, next_cursor = paginate_keyset(post_query(fields, include), Post, cursor, limit)
+        except InvalidCursor as e:
+            return {'message': str(e)}, 400
+
         return {
-            'posts': [{
-                'id': post.id,
-                'title': post.title,
-                'content': post.content,
-                'author': post.author.username,
-                'created_at': post.created_at.isoformat(),
-                'comments_count': len(post.comments)
-            } for post in posts]
-        }, 200
+            'posts': [serialize_post(post, fields, include) for post in posts],
+            'next_cursor': next_cursor
+        }, 200, validator_headers(etag, last_modified)
 
     @jwt_required()
     def post(self):
@@ -169,34 +311,167 @@ class PostListAPI(Resource):
 
         post = Post(title=title, content=content, user_id=current_user_id)
         db.session.add(post)
+        ListVersion.bump('posts')
         db.session.commit()
+        search_index.index_post(post)
 
         return {'message': 'Пост створено', 'post_id': post.id}, 201
 
 
+class PostBulkAPI(Resource):
+    @expensive_route
+    @jwt_required()
+    def post(self):
+        """Створити пости пакетом в одній транзакції"""
+        items, error = bulk_items('posts')
+        if error:
+            return error
+
+        current_user_id = get_jwt_identity()
+        results, rows, positions = [], [], []
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            title, content = item.get('title'), item.get('content')
+            if not title or not content:
+                results.append({'index': index, 'status': 'error', 'message': 'Заголовок та зміст обов\'язкові'})
+            elif not isinstance(title, str) or not isinstance(content, str):
+                results.append({'index': index, 'status': 'invalid', 'message': 'Заголовок та зміст мають бути рядками'})
+            elif len(title) > 100:
+                results.append({'index': index, 'status': 'error', 'message': 'Заголовок довший за 100 символів'})
+            else:
+                results.append({'index': index, 'status': 'created'})
+                rows.append({'title': title, 'content': content, 'excerpt': make_excerpt(content), 'user_id': current_user_id})
+                positions.append(index)
+
+        if rows:
+            ids = bulk_insert(Post, rows)
+            ListVersion.bump('posts')
+            db.session.commit()
+
+            for index, post_id in zip(positions, ids):
+                results[index]['post_id'] = post_id
+
+            if ids[0] is None:
+                # Без id не можемо оновити індекс точково — підтягне наступна синхронізація
+                search_index.invalidate()
+            else:
+                for post_id, row in zip(ids, rows):
+                    search_index.index_document(post_id, row['title'], row['content'])
+
+        return {'results': results, 'created': len(rows), 'failed': len(items) - len(rows)}, \
+            bulk_status(results, len(rows))
+
+    @expensive_route
+    @jwt_required()
+    def delete(self):
+        """Видалити пости пакетом (set-based DELETE в одній транзакції)"""
+        items, error = bulk_items('ids')
+        if error:
+            return error
+
+        current_user_id = get_jwt_identity()
+        current_user = current_identity()
+
+        requested = [item for item in items if is_id(item)]
+        owners = dict(db.session.query(Post.id, Post.user_id).filter(Post.id.in_(requested)).all()) if requested else {}
+
+        results, deletable = [], []
+        for index, post_id in enumerate(items):
+            if not is_id(post_id):
+                results.append({'index': index, 'status': 'invalid', 'message': 'Некоректний id'})
+            elif post_id not in owners:
+                results.append({'index': index, 'post_id': post_id, 'status': 'not_found'})
+            elif owners[post_id] != current_user_id and not current_user.is_admin:
+                results.append({'index': index, 'post_id': post_id, 'status': 'forbidden'})
+            else:
+                results.append({'index': index, 'post_id': post_id, 'status': 'deleted'})
+                deletable.append(post_id)
+
+        deletable = list(dict.fromkeys(deletable))
+        if deletable:
+            # Core DELETE оминає ORM-каскад, тому коментарі видаляємо явно
+            db.session.execute(db.delete(Comment).where(Comment.post_id.in_(deletable)))
+            db.session.execute(db.delete(Post).where(Post.id.in_(deletable)))
+            ListVersion.bump('posts')
+            db.session.commit()
+
+            for post_id in deletable:
+                search_index.remove_post(post_id)
+                invalidate_post(post_id)
+
+        return {'results': results, 'deleted': len(deletable)}, \
+            200 if deletable else 400
+
+
+class CommentBulkAPI(Resource):
+    @expensive_route
+    @jwt_required()
+    def post(self):
+        """Створити коментарі пакетом в одній транзакції"""
+        items, error = bulk_items('comments')
+        if error:
+            return error
+
+        current_user_id = get_jwt_identity()
+        items = [item if isinstance(item, dict) else {} for item in items]
+
+        # Існування постів перевіряємо одним запитом
+        post_ids = {item.get('post_id') for item in items if is_id(item.get('post_id'))}
+        existing = {row.id for row in db.session.query(Post.id).filter(Post.id.in_(post_ids))} if post_ids else set()
+
+        results, rows = [], []
+        for index, item in enumerate(items):
+            content, post_id = item.get('content'), item.get('post_id')
+            if content is not None and not isinstance(content, str) or post_id is not None and not is_id(post_id):
+                results.append({'index': index, 'status': 'invalid', 'message': 'Зміст має бути рядком, post_id — цілим числом'})
+            elif not content or len(content) > 500:
+                results.append({'index': index, 'status': 'error', 'message': 'Коментар має містити від 1 до 500 символів'})
+            elif post_id not in existing:
+                results.append({'index': index, 'status': 'error', 'message': 'Пост не знайдено'})
+            else:
+                results.append({'index': index, 'status': 'created'})
+                rows.append({'content': content, 'post_id': post_id, 'user_id': current_user_id})
+
+        if rows:
+            ids = bulk_insert(Comment, rows)
+            touched = {row['post_id'] for row in rows}
+            Post.touch_by_ids(touched)
+            db.session.commit()
+            for post_id in touched:
+                invalidate_post(post_id)
+
+            created = iter(ids)
+            for result in results:
+                if result['status'] == 'created':
+                    result['comment_id'] = next(created)
+
+        return {'results': results, 'created': len(rows), 'failed': len(items) - len(rows)}, \
+            bulk_status(results, len(rows))
+
+
 class PostAPI(Resource):
+    @replica_reads
+    @query_budget(3)
     def get(self, post_id):
-        """Отримати пост з коментарями"""
-        post = Post.query.get_or_404(post_id)
-        return {
-            'id': post.id,
-            'title': post.title,
-            'content': post.content,
-            'author': post.author.username,
-            'created_at': post.created_at.isoformat(),
-            'comments': [{
-                'id': comment.id,
-                'content': comment.content,
-                'author': comment.author.username,
-                'created_at': comment.created_at.isoformat()
-            } for comment in post.comments]
-        }, 200
+        """Отримати пост з коментарями (?fields=, ?include=; за замовчуванням include=comments)"""
+        try:
+            fields, include = requested_fieldset(('id', 'title', 'content', 'author', 'created_at'), ('comments',))
+        except InvalidFieldset as e:
+            return {'message': str(e)}, 400
+
+        validators = db.session.query(Post.version, Post.updated_at).filter_by(id=post_id).first_or_404()
+        etag = make_etag('post', post_id, validators.version, validators.updated_at, fields, include)
+        if is_not_modified(request.headers, etag, validators.updated_at):
+            return not_modified_response(etag, validators.updated_at)
+
+        post = post_query(fields, include).filter(Post.id == post_id).first_or_404()
+        return serialize_post(post, fields, include), 200, validator_headers(etag, validators.updated_at)
 
     @jwt_required()
     def put(self, post_id):
         """Оновити пост"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
         post = Post.query.get_or_404(post_id)
 
         if post.user_id != current_user_id and not current_user.is_admin:
@@ -205,29 +480,110 @@ class PostAPI(Resource):
         data = request.get_json()
         post.title = data.get('title', post.title)
         post.content = data.get('content', post.content)
+        post.touch()
 
         db.session.commit()
+        search_index.index_post(post)
+        invalidate_post(post_id)
         return {'message': 'Пост оновлено'}, 200
 
     @jwt_required()
     def delete(self, post_id):
         """Видалити пост"""
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
         post = Post.query.get_or_404(post_id)
 
         if post.user_id != current_user_id and not current_user.is_admin:
             return {'message': 'Доступ заборонений'}, 403
 
         db.session.delete(post)
+        ListVersion.bump('posts')
         db.session.commit()
+        search_index.remove_post(post_id)
+        invalidate_post(post_id)
         return {'message': 'Пост видалено'}, 200
 
 
+class PostSearchAPI(Resource):
+    @expensive_route
+    def get(self):
+        """Повнотекстовий пошук постів (BM25, префікси)"""
+        query = request.args.get('q', '').strip()
+        if not query:
+            return {'message': 'Параметр q обов\'язковий'}, 400
+
+        limit = parse_limit(request.args.get('limit'), 20, current_app.config['SEARCH_MAX_RESULTS'])
+
+        if not search_index.ready(current_app._get_current_object()):
+            return {'message': 'Пошуковий індекс ще будується, спробуйте пізніше'}, 503, \
+                {'Retry-After': str(current_app.config['SEARCH_RETRY_AFTER'])}
+        # Зміни інших воркерів (не частіше ніж раз на SEARCH_SYNC_INTERVAL)
+        search_index.maybe_sync()
+
+        started = perf_counter()
+        hits = search_index.search(query, limit)
+        took_ms = (perf_counter() - started) * 1000
+
+        # Дані постів одним запитом, порядок — за релевантністю
+        posts = {}
+        if hits:
+            found = post_query(POST_LIST_FIELDS, ()).filter(Post.id.in_([post_id for post_id, _ in hits]))
+            posts = {post.id: post for post in found}
+
+        results = []
+        for post_id, score in hits:
+            post = posts.get(post_id)
+            if post is None:
+                continue
+            result = serialize_post(post, POST_LIST_FIELDS, ())
+            result['score'] = round(score, 4)
+            results.append(result)
+
+        return {'query': query, 'results': results, 'took_ms': round(took_ms, 3)}, 200
+
+
+class CacheStatsAPI(Resource):
+    @admission_exempt
+    @jwt_required()
+    def get(self):
+        """Статистика кешів процесу (адмін)"""
+        if not current_identity().is_admin:
+            return {'message': 'Доступ заборонений'}, 403
+
+        return {'identity': identity_cache.stats(), 'fragments': fragment_cache.stats()}, 200
+
+
+class ReplicaStatsAPI(Resource):
+    @admission_exempt
+    @jwt_required()
+    def get(self):
+        """Стан реплік: здоров'я, відставання, кількість читань (адмін)"""
+        if not current_identity().is_admin:
+            return {'message': 'Доступ заборонений'}, 403
+
+        return replica_router.stats(), 200
+
+
+class AdmissionStatsAPI(Resource):
+    @admission_exempt
+    @jwt_required()
+    def get(self):
+        """Поточний адаптивний ліміт і кількість відхилених запитів (адмін)"""
+        if not current_identity().is_admin:
+            return {'message': 'Доступ заборонений'}, 403
+
+        return {'admission': admission_control.stats()}, 200
+
+
 def init_api(app):
     """Ініціалізація API"""
     api = Api(app)
 
+    # Швидкий JSON-бекенд (orjson або stdlib) для всіх ресурсів
+    json_codec.init_app(app)
+    api.representation('application/json')(output_json)
+
     # Auth endpoints
     api.add_resource(AuthAPI, '/api/auth/login')
 
@@ -237,6 +593,14 @@ def init_api(app):
 
     # Post endpoints
     api.add_resource(PostListAPI, '/api/posts')
+    api.add_resource(PostSearchAPI, '/api/posts/search')
+    api.add_resource(PostBulkAPI, '/api/posts/bulk')
+    api.add_resource(CommentBulkAPI, '/api/comments/bulk')
     api.add_resource(PostAPI, '/api/posts/<int:post_id>')
 
+    # Service endpoints
+    api.add_resource(CacheStatsAPI, '/api/stats/cache')
+    api.add_resource(ReplicaStatsAPI, '/api/stats/replicas')
+    api.add_resource(AdmissionStatsAPI, '/api/stats/admission')
+
     return api
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Мікробенчмарк серіалізації великих списків постів
+
+Порівнює колишній шлях (ручний isoformat + stdlib json, як web.json_response)
+з JSONCodec на stdlib json та на orjson.
+
+Приклад:
+    python -m benchmarks.json_encoding --posts 5000 --repeat 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from json_codec import JSONCodec, orjson
+from seeder import paragraph, sentence
+
+
+def make_posts(count, seed):
+    """Рядки у формі відповіді GET /api/async/posts"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [{
+        'id': index + 1,
+        'title': sentence(rng, 3, 8)[:100],
+        'content': paragraph(rng, rng.randint(1, 12)),
+        'created_at': start + timedelta(seconds=index * 37, microseconds=rng.randint(0, 999999)),
+        'author_name': f'user{rng.randint(1, 500)}',
+        'comments_count': rng.randint(0, 40)
+    } for index in range(count)]
+
+
+def legacy_dumps(posts):
+    """Як було: копія з isoformat у циклі, далі json.dumps з налаштуваннями за замовчуванням"""
+    rows = []
+    for post in posts:
+        row = dict(post)
+        row['created_at'] = row['created_at'].isoformat()
+        rows.append(row)
+    return json.dumps({'success': True, 'posts': rows, 'count': len(rows)}).encode('utf-8')
+
+
+def measure(encode, posts, repeat):
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(encode(posts))
+        best = min(best, time.perf_counter() - started)
+    return best, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Мікробенчмарк JSON-серіалізації списку постів')
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20, help='Прогонів; береться найкращий')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    posts = make_posts(args.posts, args.seed)
+    candidates = [('stdlib (isoformat вручну)', legacy_dumps)]
+
+    stdlib = JSONCodec('json')
+    candidates.append(('JSONCodec[json]', lambda rows: stdlib.dumps({'success': True, 'posts': rows, 'count': len(rows)})))
+    if orjson is not None:
+        fast = JSONCodec('orjson')
+        candidates.append(('JSONCodec[orjson]', lambda rows: fast.dumps({'success': True, 'posts': rows, 'count': len(rows)})))
+    else:
+        print('orjson не встановлено — порівнюється лише stdlib')
+
+    baseline = None
+    print(f'{args.posts} постів, найкращий з {args.repeat} прогонів')
+    for name, encode in candidates:
+        elapsed, size = measure(encode, posts, args.repeat)
+        baseline = baseline or elapsed
+        print(f'{name:28} {elapsed * 1000:9.2f} ms  {size / 1024 / 1024 / elapsed:8.1f} МБ/с  '
+              f'{size / 1024:9.1f} КБ  x{baseline / elapsed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""Навантажувальний тест Flask (main.app) та aiohttp (AsyncBlogAPI) серверів
+
+Приклад:
+    python -m benchmarks.load_test --posts 5000 --concurrency 32 --duration 10
+    python -m benchmarks.load_test --compare bench-old.json --output bench-new.json
+
+Сервери запускаються в окремих процесах проти тимчасової SQLite (або будь-якої
+БД з --database-url), тож клієнт і сервер не ділять один event loop / GIL.
+Чужу БД тест перестворює лише з явним --reset (або використовує як є з --no-seed).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def seed_database(database_url, users, posts, comments, seed, reset=False):
+    """Заповнити БД детерміновано сідером (однаковий seed — однакові дані)
+
+    reset=True спершу видаляє всі таблиці — лише для тимчасової БД або з --reset.
+    """
+    os.environ['DATABASE_URL'] = database_url
+    from factory import create_base_app
+    from models import db
+    from hashing import password_hasher
+    from seeder import seed_database as generate
+
+    app = create_base_app()
+    with app.app_context():
+        if reset:
+            db.drop_all()
+        db.create_all()
+        generate(users=users, posts=posts, comments=posts * comments, seed=seed, report=lambda line: None)
+        db.engine.dispose()
+    password_hasher.shutdown(wait=True)
+
+
+def serve_flask(database_url, port):
+    """Процес Flask-сервера (багатопотоковий werkzeug)"""
+    os.environ['DATABASE_URL'] = database_url
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from main import app
+    from hashing import password_hasher
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    # Інакше воркери пулу хешування переживуть сервер
+    def stop(signum, frame):
+        password_hasher.shutdown(wait=True)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+
+    make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler).serve_forever()
+
+
+def serve_aiohttp(database_url, port):
+    """Процес aiohttp-сервера; для SQLite — пул-замінник aiomysql"""
+    from aiohttp import web
+    from sqlalchemy.engine import make_url
+    from aiohttp_server import AsyncBlogAPI
+
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        from benchmarks.sqlite_pool import create_sqlite_pool
+        api = AsyncBlogAPI(
+            db_config={'host': '', 'user': '', 'password': '', 'database': url.database},
+            pool_factory=create_sqlite_pool
+        )
+    else:
+        api = AsyncBlogAPI(db_config={
+            'host': url.host,
+            'port': url.port or 3306,
+            'user': url.username,
+            'password': url.password,
+            'database': url.database
+        })
+
+    web.run_app(api.app, host='127.0.0.1', port=port, print=None)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Сервер на порту {port} не піднявся за {timeout} с')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0,
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p95_ms': to_ms(percentile(latencies, 0.95)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+        'max_ms': to_ms(latencies[-1] if latencies else None)
+    }
+
+
+async def drive(session, base_url, make_request, concurrency, duration, warmup):
+    """Фіксована кількість конкурентних клієнтів протягом duration секунд"""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    latencies = []
+    errors = 0
+    measure_from = loop.time() + warmup
+    deadline = measure_from + duration
+
+    async def client():
+        nonlocal errors
+        while loop.time() < deadline:
+            method, path, kwargs = make_request()
+            started = time.perf_counter()
+            try:
+                async with session.request(method, base_url + path, **kwargs) as response:
+                    await response.read()
+                    failed = response.status >= 400
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                failed = True
+            took = time.perf_counter() - started
+
+            if loop.time() >= measure_from:
+                latencies.append(took)
+                errors += failed
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, errors, duration)
+
+
+def scenarios(args):
+    """Ендпоінти для прогону: (сервер, назва, генератор запитів)"""
+    rng = random.Random(args.seed)
+    from seeder import ADMIN_EMAIL, ADMIN_PASSWORD
+
+    login_body = {'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD}
+    return [
+        ('flask', 'GET /api/posts', lambda: ('GET', '/api/posts', {})),
+        ('flask', 'GET /api/posts/<id>', lambda: ('GET', f'/api/posts/{rng.randint(1, args.posts)}', {})),
+        ('flask', 'POST /api/auth/login', lambda: ('POST', '/api/auth/login', {'json': login_body})),
+        ('aiohttp', 'GET /api/async/posts', lambda: ('GET', '/api/async/posts', {})),
+        ('aiohttp', 'GET /api/async/users', lambda: ('GET', '/api/async/users', {})),
+    ]
+
+
+async def run_scenarios(args, ports):
+    import aiohttp
+
+    results = {}
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        for server, name, make_request in scenarios(args):
+            if args.only and not any(part in name for part in args.only):
+                continue
+            base_url = f'http://127.0.0.1:{ports[server]}'
+            results[name] = await drive(session, base_url, make_request, args.concurrency, args.duration, args.warmup)
+            results[name]['server'] = server
+            print(f'{name:28} {results[name]["throughput_rps"]:>9} req/s  '
+                  f'p50 {results[name]["p50_ms"]} ms  p95 {results[name]["p95_ms"]} ms  '
+                  f'p99 {results[name]["p99_ms"]} ms  errors {results[name]["errors"]}')
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path, results):
+    """Порівняти з попереднім прогоном (наприклад, з іншого коміту)"""
+    with open(previous_path, encoding='utf-8') as previous_file:
+        previous = json.load(previous_file)
+
+    print(f'\nПорівняння з {previous_path} (коміт {previous["meta"].get("commit")}):')
+    for name, current in results.items():
+        before = previous['results'].get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ('throughput_rps', 'p50_ms', 'p99_ms'):
+            if before.get(key) and current.get(key) is not None:
+                deltas.append(f'{key} {(current[key] - before[key]) / before[key] * 100:+.1f}%')
+        print(f'{name:28} ' + '  '.join(deltas))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Навантажувальний тест Flask та aiohttp серверів')
+    parser.add_argument('--database-url', help='БД для обох серверів (за замовчуванням тимчасова SQLite)')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=3, help='Коментарів на пост у середньому')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-seed', action='store_true', help='Не перестворювати дані')
+    parser.add_argument('--reset', action='store_true', help='Дозволити видалити всі таблиці --database-url перед заповненням')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10, help='Секунд вимірювання на ендпоінт')
+    parser.add_argument('--warmup', type=float, default=2, help='Секунд прогріву на ендпоінт')
+    parser.add_argument('--request-timeout', type=float, default=30)
+    parser.add_argument('--only', nargs='*', help='Запускати лише ендпоінти, що містять ці підрядки')
+    parser.add_argument('--output', help='Куди зберегти JSON з результатами')
+    parser.add_argument('--compare', help='JSON попереднього прогону для порівняння')
+    args = parser.parse_args(argv)
+    if args.database_url and not (args.reset or args.no_seed):
+        parser.error('--database-url буде очищено перед заповненням: додайте --reset або --no-seed')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Тимчасова SQLite видаляється разом з каталогом навіть після помилки
+    with tempfile.TemporaryDirectory(prefix='blog-bench-') as workdir:
+        if args.database_url:
+            benchmark(args, args.database_url, reset=args.reset)
+        else:
+            benchmark(args, f'sqlite:///{os.path.join(workdir, "bench.db")}', reset=True)
+
+
+def benchmark(args, database_url, reset):
+    if not args.no_seed:
+        started = time.perf_counter()
+        seed_database(database_url, args.users, args.posts, args.comments, args.seed, reset)
+        print(f'Дані створено за {time.perf_counter() - started:.1f} с')
+
+    context = multiprocessing.get_context('spawn')
+    ports = {'flask': free_port(), 'aiohttp': free_port()}
+    # Не daemon: Flask-серверу потрібен власний пул процесів для хешування паролів
+    servers = [
+        context.Process(target=serve_flask, args=(database_url, ports['flask'])),
+        context.Process(target=serve_aiohttp, args=(database_url, ports['aiohttp'])),
+    ]
+    for server in servers:
+        server.start()
+
+    try:
+        for port in ports.values():
+            wait_for_port(port)
+        results = asyncio.run(run_scenarios(args, ports))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.join(5)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': 'sqlite' if database_url.startswith('sqlite') else database_url.split(':', 1)[0],
+            'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+        },
+        'results': results
+    }
+
+    output = args.output or f'bench-{report["meta"]["commit"] or "local"}-{int(time.time())}.json'
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=2, ensure_ascii=False)
+    print(f'\nРезультати збережено в {output}')
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
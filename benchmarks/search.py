@@ -0,0 +1,112 @@
+"""Затримка пошуку SearchIndex на синтетичному зіпфівському корпусі
+
+Індекс будується напряму в пам'яті (без БД) з --posts документів, слова
+яких мають зіпфівський розподіл частот. Далі для кожного типу запиту
+(часте слово, рідкісне, кілька слів, короткий префікс) виконується --queries
+запитів і друкуються p50/p99/максимум, а також пікова пам'ять процесу.
+
+Індекс у пам'яті воркера розрахований на сотні тисяч постів: на 100k
+одне слово, префікс чи кілька слів — менше мілісекунди в p50, пара дуже
+частих слів — 1-2 мс. Пам'ять росте лінійно (~1 ГБ на 100k постів
+по 20-150 слів), тож 1M постів потребує окремого пошукового рушія.
+
+Приклад:
+    python -m benchmarks.search --posts 100000
+    python -m benchmarks.search --posts 1000000 --vocabulary 200000
+"""
+import argparse
+import gc
+import os
+import resource
+import random
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from search import SearchIndex, TITLE_WEIGHT
+from seeder import zipf_index
+
+SYLLABLES = 'ба ве ги до ку ла ме ні по ру са те ці ша ю ка ро мі ли на'.split()
+
+
+def make_vocabulary(size, rng):
+    """Псевдослова зі складів: у словнику є довгі спільні префікси, як у живій мові"""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def build_index(posts, vocabulary, rng, skew):
+    index = SearchIndex()
+    for post_id in range(1, posts + 1):
+        terms = Counter(vocabulary[zipf_index(rng, len(vocabulary), skew)] for _ in range(rng.randint(20, 150)))
+        for _ in range(rng.randint(3, 8)):
+            terms[vocabulary[zipf_index(rng, len(vocabulary), skew)]] += TITLE_WEIGHT
+        index._store(post_id, terms)
+    index._index_all()
+    index.built = True
+    return index
+
+
+def make_queries(vocabulary, rng, count):
+    common = vocabulary[:20]
+    middle = vocabulary[1000:5000]
+    rare = vocabulary[-5000:]
+    return {
+        'часте слово': [rng.choice(common) + ' ' for _ in range(count)],
+        'середнє слово': [rng.choice(middle) + ' ' for _ in range(count)],
+        'рідкісне слово': [rng.choice(rare) + ' ' for _ in range(count)],
+        'два часті слова': [f'{rng.choice(common)} {rng.choice(common)} ' for _ in range(count)],
+        'три слова': [f'{rng.choice(common)} {rng.choice(middle)} {rng.choice(rare)} ' for _ in range(count)],
+        'префікс (2 літери)': [rng.choice(common)[:2] for _ in range(count)],
+        'слово + префікс': [f'{rng.choice(common)} {rng.choice(middle)[:3]}' for _ in range(count)],
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Затримка повнотекстового пошуку')
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    parser.add_argument('--skew', type=float, default=1.0, help='Показник Зіпфа для частот слів')
+    parser.add_argument('--queries', type=int, default=200, help='Запитів кожного типу')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+
+    started = time.perf_counter()
+    index = build_index(args.posts, vocabulary, rng, args.skew)
+    print(f'Індекс: {args.posts} постів, {len(index.impacts)} термінів, '
+          f'побудова {time.perf_counter() - started:.1f} с')
+    # Сміття після побудови не має потрапити в заміри перших запитів
+    gc.collect()
+
+    print(f'{"запит":22} {"p50, мс":>9} {"p99, мс":>9} {"макс, мс":>9}')
+    for name, queries in make_queries(vocabulary, rng, args.queries).items():
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, args.limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f'{name:22} {percentile(timings, 0.5):9.3f} {percentile(timings, 0.99):9.3f} {max(timings):9.3f}')
+
+    # ru_maxrss — кілобайти в Linux
+    print(f'Пікова пам\'ять процесу: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} МБ')
+
+
+if __name__ == '__main__':
+    main()
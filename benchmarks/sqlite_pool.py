@@ -0,0 +1,131 @@
+"""SQLite замість MySQL для AsyncBlogAPI (бенчмарки та локальні перевірки)
+
+Реалізує ту частину інтерфейсу aiomysql-пулу, якою користується AsyncBlogAPI:
+acquire/release, cursor(DictCursor) як async context manager, execute/fetch*.
+Запити виконуються в потоках, щоб не блокувати event loop.
+"""
+import asyncio
+import sqlite3
+from datetime import datetime
+
+DATETIME_FIELDS = ('created_at', 'updated_at', 'last_modified', 'changed_at', 'last_updated')
+
+
+def _convert_row(columns, values):
+    row = dict(zip(columns, values))
+    for key in DATETIME_FIELDS:
+        value = row.get(key)
+        if isinstance(value, str):
+            row[key] = datetime.fromisoformat(value)
+    return row
+
+
+class SQLiteCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def _execute(self, query, args, many):
+        query = query.replace('%s', '?')
+        cursor = self.conn.raw.executemany(query, args) if many else self.conn.raw.execute(query, args or ())
+        columns = [column[0] for column in cursor.description] if cursor.description else []
+        rows = [_convert_row(columns, values) for values in cursor.fetchall()] if columns else []
+        lastrowid = cursor.lastrowid
+        if lastrowid and not many and query.lstrip().upper().startswith('INSERT') and cursor.rowcount > 1:
+            # Як у MySQL: lastrowid багаторядкового INSERT — id першого рядка, а не останнього
+            lastrowid -= cursor.rowcount - 1
+        return rows, cursor.rowcount, lastrowid
+
+    async def execute(self, query, args=None):
+        self.rows, self.rowcount, self.lastrowid = await asyncio.to_thread(self._execute, query, args, False)
+        return self.rowcount
+
+    async def executemany(self, query, args):
+        self.rows, self.rowcount, self.lastrowid = await asyncio.to_thread(self._execute, query, args, True)
+        return self.rowcount
+
+    async def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    async def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class SQLiteConnection:
+    def __init__(self, path):
+        # isolation_level=None — autocommit, як у пулі AsyncBlogAPI
+        self.raw = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.raw.execute('PRAGMA journal_mode=WAL')
+        self.raw.execute('PRAGMA busy_timeout=5000')
+        self.closed = False
+
+    def cursor(self, cursor_class=None):
+        return SQLiteCursor(self)
+
+    def _finish(self, statement):
+        if self.raw.in_transaction:
+            self.raw.execute(statement)
+
+    async def begin(self):
+        await asyncio.to_thread(self.raw.execute, 'BEGIN IMMEDIATE')
+
+    async def commit(self):
+        await asyncio.to_thread(self._finish, 'COMMIT')
+
+    async def rollback(self):
+        await asyncio.to_thread(self._finish, 'ROLLBACK')
+
+    def close(self):
+        self.raw.close()
+        self.closed = True
+
+
+class SQLitePool:
+    def __init__(self, path, minsize, maxsize):
+        self.path = path
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.free = asyncio.Queue()
+        self.connections = []
+
+    @property
+    def size(self):
+        return len(self.connections)
+
+    @property
+    def freesize(self):
+        return self.free.qsize()
+
+    async def acquire(self):
+        if self.free.empty() and self.size < self.maxsize:
+            conn = SQLiteConnection(self.path)
+            self.connections.append(conn)
+            return conn
+        return await self.free.get()
+
+    def release(self, conn):
+        self.free.put_nowait(conn)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+    async def wait_closed(self):
+        pass
+
+
+async def create_sqlite_pool(minsize=1, maxsize=10, db=None, **kwargs):
+    """Сумісна з aiomysql.create_pool фабрика: db — шлях до файлу SQLite"""
+    return SQLitePool(db, minsize, maxsize)
@@ -0,0 +1,112 @@
+"""Час холодного старту: імпорт додатку, перший запит, CLI та скрипти
+
+Кожен сценарій запускається в новому процесі інтерпретатора --runs разів;
+вимірюється повний час процесу (разом зі стартом Python), береться мінімум
+і медіана. Рядок «python» — порожній інтерпретатор для порівняння.
+
+БД заповнюється сідером (--posts постів), бо найдорожча частина старту
+воркера — пошуковий індекс — залежить від обсягу даних. Сценарій «пошук
+готовий» чекає, поки фонова побудова індексу дозволить першому пошуку
+відповісти 200.
+
+Приклад:
+    python -m benchmarks.startup --runs 10 --posts 20000
+    python -m benchmarks.startup --importtime 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SCENARIOS = [
+    ('python', ['-c', 'pass']),
+    ('import main (воркер)', ['-c', 'import main']),
+    ('перший запит', ['-c', (
+        'import main\n'
+        'response = main.app.test_client().get("/api/posts?limit=1")\n'
+        'assert response.status_code == 200, response.status_code'
+    )]),
+    ('пошук готовий', ['-c', (
+        'import time, main\n'
+        'client = main.app.test_client()\n'
+        'while client.get("/api/posts/search?q=the").status_code == 503:\n'
+        '    time.sleep(0.01)'
+    )]),
+    ('скрипт (create_base_app)', ['-c', 'from factory import create_base_app; create_base_app()']),
+    ('flask routes (CLI)', ['-m', 'flask', '--app', 'main', 'routes']),
+    ('import aiohttp_server', ['-c', 'import aiohttp_server']),
+]
+
+
+def prepare_database(path, users, posts):
+    """Заповнена БД: час старту, що залежить від обсягу даних, має бути видно"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    from factory import create_base_app
+    from models import db
+    from hashing import password_hasher
+    from seeder import seed_database
+
+    app = create_base_app()
+    with app.app_context():
+        db.create_all()
+        seed_database(users=users, posts=posts, comments=posts * 3, report=lambda line: None)
+        db.engine.dispose()
+    password_hasher.shutdown(wait=True)
+
+
+def run(args, env):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def heaviest_imports(env, count):
+    """Найдовші імпорти верхнього рівня для import main (python -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Прямі імпорти main (відступ на рівень глибше); вкладені вже враховані в cumulative
+        if cumulative.strip().isdigit() and name.startswith('   ') and not name.startswith('    '):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Час холодного старту додатку')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--importtime', type=int, default=0, metavar='N', help='Показати N найдовших імпортів main')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        prepare_database(os.path.join(directory, 'startup.db'), args.users, args.posts)
+        # Без знімка: кожен прогін будує індекс з БД, як перший старт після деплою
+        env = {**os.environ, 'PASSWORD_HASH_WORKERS': '0', 'SEARCH_INDEX_SNAPSHOT': 'off'}
+
+        print(f'{"сценарій":28} {"мін, мс":>9} {"медіана, мс":>12}')
+        for name, scenario in SCENARIOS:
+            timings = [run(scenario, env) for _ in range(args.runs)]
+            print(f'{name:28} {min(timings) * 1000:9.1f} {statistics.median(timings) * 1000:12.1f}')
+
+        if args.importtime:
+            print('\nНайдовші імпорти import main:')
+            for cumulative, name in heaviest_imports(env, args.importtime):
+                print(f'{cumulative / 1000:9.1f} мс  {name}')
+
+
+if __name__ == '__main__':
+    main()
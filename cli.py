@@ -0,0 +1,226 @@
+import json
+import sys
+import time
+from datetime import datetime
+import click
+from models import db, User, Post, Comment, ListVersion, make_excerpt
+from search import search_index, snapshot_path
+from seeder import seed_database
+from query_plans import HOT_QUERIES, check_query_plans
+
+FORMAT_NAME = 'flask-blog-ndjson'
+FORMAT_VERSION = 1
+
+# Порядок важливий: батьківські таблиці перед дочірніми, щоб зовнішні ключі були валідні
+EXPORT_MODELS = [('user', User), ('post', Post), ('comment', Comment)]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_row(table, data):
+    """Відновити типи колонок (datetime) з JSON-рядка"""
+    row = {}
+    for column in table.columns:
+        if column.name not in data:
+            continue
+        value = data[column.name]
+        if value is not None and isinstance(column.type, db.DateTime):
+            value = datetime.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+
+class Throughput:
+    """Лічильник рядків за секунду для звіту в stderr"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts = {}
+
+    def add(self, kind, count=1):
+        self.counts[kind] = self.counts.get(kind, 0) + count
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def report(self, action):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        details = ', '.join(f'{kind}: {count}' for kind, count in self.counts.items())
+        click.echo(
+            f'{action} {self.total} рядків ({details}) за {elapsed:.2f} с — {self.total / elapsed:.0f} рядків/с',
+            err=True
+        )
+
+
+def export_ndjson(out, chunk_size=1000):
+    """Потоково вивантажити всі таблиці в NDJSON (пам'ять не залежить від розміру БД)"""
+    stats = Throughput()
+    out.write(json.dumps({'format': FORMAT_NAME, 'version': FORMAT_VERSION}) + '\n')
+
+    with db.engine.connect() as conn:
+        for kind, model in EXPORT_MODELS:
+            table = model.__table__
+            # stream_results вмикає серверний курсор (SSCursor для PyMySQL)
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size) \
+                .execute(db.select(table).order_by(table.c.id))
+
+            for row in result.mappings():
+                data = {key: _encode_value(value) for key, value in row.items()}
+                out.write(json.dumps({'type': kind, 'data': data}, ensure_ascii=False) + '\n')
+                stats.add(kind)
+
+    return stats
+
+
+def import_ndjson(lines, chunk_size=1000):
+    """Пакетно завантажити NDJSON, збережений export_ndjson"""
+    stats = Throughput()
+    tables = {kind: model.__table__ for kind, model in EXPORT_MODELS}
+    order = [kind for kind, _ in EXPORT_MODELS]
+    buffers = {kind: [] for kind in order}
+
+    def flush(upto):
+        # Скидаємо також усі батьківські буфери, щоб рядки-посилання вже існували
+        for kind in order[:order.index(upto) + 1]:
+            if buffers[kind]:
+                db.session.execute(tables[kind].insert(), buffers[kind])
+                stats.add(kind, len(buffers[kind]))
+                buffers[kind] = []
+        db.session.commit()
+
+    header = None
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+
+        if header is None:
+            header = record
+            if header.get('format') != FORMAT_NAME or header.get('version') != FORMAT_VERSION:
+                raise click.ClickException(f'Невідомий формат файлу (рядок {number})')
+            continue
+
+        kind = record.get('type')
+        if kind not in tables:
+            raise click.ClickException(f'Невідомий тип запису "{kind}" (рядок {number})')
+
+        row = _decode_row(tables[kind], record['data'])
+        # Експорти, зроблені до появи колонки excerpt
+        if kind == 'post' and 'excerpt' not in row:
+            row['excerpt'] = make_excerpt(row.get('content'))
+        buffers[kind].append(row)
+        if len(buffers[kind]) >= chunk_size:
+            flush(kind)
+
+    flush(order[-1])
+    # Імпортовані пости можуть мати старі updated_at — MAX по списку їх не помітить
+    ListVersion.bump('posts')
+    db.session.commit()
+    return stats
+
+
+def register_commands(app):
+    """Реєстрація CLI-команд (export, import, seed, search-reindex, explain-check)"""
+
+    @app.cli.command('export')
+    @click.argument('output', type=click.Path(allow_dash=True), default='-')
+    @click.option('--chunk-size', default=1000, show_default=True, help='Рядків на одну вибірку курсора')
+    def export_command(output, chunk_size):
+        """Експорт користувачів, постів та коментарів у NDJSON"""
+        if output == '-':
+            stats = export_ndjson(sys.stdout, chunk_size)
+        else:
+            with open(output, 'w', encoding='utf-8') as out:
+                stats = export_ndjson(out, chunk_size)
+        stats.report('Експортовано')
+
+    @app.cli.command('import')
+    @click.argument('source', type=click.Path(exists=True, allow_dash=True, dir_okay=False), default='-')
+    @click.option('--chunk-size', default=1000, show_default=True, help='Рядків в одному пакетному INSERT')
+    def import_command(source, chunk_size):
+        """Імпорт NDJSON, створеного командою flask export"""
+        db.create_all()
+        if source == '-':
+            stats = import_ndjson(sys.stdin, chunk_size)
+        else:
+            with open(source, encoding='utf-8') as lines:
+                stats = import_ndjson(lines, chunk_size)
+        stats.report('Імпортовано')
+
+    @app.cli.command('seed')
+    @click.option('--users', default=1000, show_default=True)
+    @click.option('--posts', default=10000, show_default=True)
+    @click.option('--comments', default=50000, show_default=True, help='Всього коментарів')
+    @click.option('--seed', 'random_seed', default=42, show_default=True, help='Однаковий seed — однакові дані')
+    @click.option('--batch-size', default=5000, show_default=True, help='Рядків в одному пакетному INSERT')
+    @click.option('--days', default=365, show_default=True, help='Період, за який розподілені дати')
+    @click.option('--reset', is_flag=True, help='Видалити всі таблиці перед генерацією')
+    def seed_command(users, posts, comments, random_seed, batch_size, days, reset):
+        """Згенерувати синтетичні дані довільного обсягу"""
+        if reset:
+            db.drop_all()
+        db.create_all()
+
+        if User.query.first() is not None:
+            raise click.ClickException('База даних вже містить дані (використайте --reset)')
+
+        seed_database(
+            users=users, posts=posts, comments=comments, seed=random_seed,
+            batch_size=batch_size, days=days, report=lambda line: click.echo(line, err=True)
+        )
+
+    @app.cli.command('search-reindex')
+    @click.option('--snapshot', type=click.Path(dir_okay=False), default=None,
+                  help='Куди зберегти знімок (за замовчуванням SEARCH_INDEX_SNAPSHOT)')
+    def search_reindex_command(snapshot):
+        """Перебудувати пошуковий індекс і зберегти знімок"""
+        snapshot = snapshot or snapshot_path(app)
+        if not snapshot:
+            raise click.ClickException('Вкажіть --snapshot (SEARCH_INDEX_SNAPSHOT=off)')
+
+        started = time.perf_counter()
+        search_index.build()
+        search_index.save(snapshot)
+        click.echo(
+            f'Проіндексовано {len(search_index.doc_len)} постів, '
+            f'{len(search_index.impacts)} термінів за {time.perf_counter() - started:.2f} с',
+            err=True
+        )
+
+    @app.cli.command('explain-check')
+    @click.argument('names', nargs=-1)
+    @click.option('--verbose', '-v', is_flag=True, help='Показати повний план кожного запиту')
+    def explain_check_command(names, verbose):
+        """Перевірити плани гарячих запитів (без повних сканів та filesort)
+
+        На крихітних таблицях оптимізатор MySQL може обрати повний скан навіть
+        за наявності індексу — запускайте на даних реального обсягу (flask seed).
+        """
+        unknown = set(names) - set(HOT_QUERIES)
+        if unknown:
+            raise click.ClickException(f'Невідомі запити: {", ".join(sorted(unknown))}')
+
+        try:
+            results = check_query_plans(names)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        failed = 0
+        for name, plan, problems in results:
+            if problems:
+                failed += 1
+                click.echo(f'FAIL {name}: {"; ".join(problems)}')
+            else:
+                click.echo(f'OK   {name}')
+            if verbose or problems:
+                for row in plan:
+                    click.echo('       ' + ' | '.join(f'{key}={value}' for key, value in row.items() if value is not None))
+
+        if failed:
+            raise click.ClickException(f'{failed} з {len(results)} запитів мають повний скан або filesort')
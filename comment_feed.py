@@ -0,0 +1,240 @@
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from contextlib import suppress
+from comment_writer import PostNotFound
+
+logger = logging.getLogger('comment_feed')
+
+# Останній коментар поста (NULL — коментарів ще немає); рядка немає — поста немає
+FEED_START_QUERY = """
+    SELECT (SELECT MAX(c.id) FROM comment c WHERE c.post_id = p.id) AS last_id
+    FROM post p
+    WHERE p.id = %s
+"""
+
+# Нові коментарі після курсора: діапазон по індексу (post_id, id)
+FEED_COMMENTS_QUERY = """
+    SELECT c.id, c.content, c.created_at,
+           u.username as author_name
+    FROM comment c
+    LEFT JOIN user u ON c.user_id = u.id
+    WHERE c.post_id = %s AND c.id > %s
+    ORDER BY c.id
+    LIMIT %s
+"""
+
+# Маркер у черзі підписника: він відстав, історії не вистачає — клієнт має перезавантажитись
+RESET = object()
+
+
+class Subscription:
+    """Підписник стріму з власним обмеженим буфером подій"""
+
+    def __init__(self, post_id, buffer_size):
+        self.post_id = post_id
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        # id останньої поставленої в буфер події (або курсора клієнта)
+        self.last_id = 0
+
+    def offer(self, event):
+        """Покласти подію без очікування; False, якщо буфер переповнено"""
+        if event[0] <= self.last_id:
+            # Вже отримано: історія та розсилка могли перетнутися при підписці
+            return True
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        self.last_id = event[0]
+        return True
+
+    def reset(self):
+        """Відкинути непрочитане й попросити клієнта почати спочатку"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESET)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class PostWatcher:
+    """Один опитувач на пост, скільки б клієнтів не дивилося стрім
+
+    Тримає курсор (id останнього коментаря) та коротку історію подій, щоб
+    підписник з Last-Event-ID дочитав пропущене з пам'яті, а не з БД.
+    """
+
+    def __init__(self, feed, post_id):
+        self.feed = feed
+        self.post_id = post_id
+        self.subscribers = set()
+        self.history = deque(maxlen=feed.history_size)
+        # Коментарі з id <= floor в історії вже (або ще) не лежать
+        self.floor = None
+        self.last_id = None
+        self.wake = asyncio.Event()
+        self.ready = asyncio.get_running_loop().create_future()
+        self.task = None
+
+    def start(self, after):
+        # Опитувач переживає запит першого підписника — без його контексту (статистики sql_timing)
+        self.task = contextvars.Context().run(asyncio.create_task, self.run(after))
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+        if not self.ready.done():
+            self.ready.cancel()
+
+    def backlog(self, after):
+        """Події після after з історії; None, якщо частина вже випала з неї"""
+        if after is None:
+            return []
+        if after < self.floor:
+            return None
+        return [event for event in self.history if event[0] > after]
+
+    async def run(self, after):
+        try:
+            async with self.feed.cursor() as cursor:
+                await cursor.execute(FEED_START_QUERY, (self.post_id,))
+                row = await cursor.fetchone()
+        except Exception as e:
+            self.ready.set_exception(e)
+            return
+        if row is None:
+            self.ready.set_exception(PostNotFound())
+            return
+
+        # Перший підписник з курсором сторінки отримає те, що з'явилося після рендеру
+        self.last_id = row['last_id'] or 0
+        if after is not None and after < self.last_id:
+            self.last_id = after
+        self.floor = self.last_id
+        self.ready.set_result(None)
+        if after is not None:
+            await self.poll()
+
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.wake.wait(), self.feed.poll_interval)
+            self.wake.clear()
+            await self.poll()
+
+    async def poll(self):
+        self.feed.stats['polls'] += 1
+        try:
+            async with self.feed.cursor() as cursor:
+                await cursor.execute(FEED_COMMENTS_QUERY, (self.post_id, self.last_id, self.feed.batch_limit))
+                rows = await cursor.fetchall()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Пул зайнятий або БД недоступна — спробуємо на наступному тіку
+            self.feed.stats['errors'] += 1
+            logger.warning('Не вдалося опитати коментарі поста %s', self.post_id, exc_info=True)
+            return
+
+        for row in rows:
+            row['post_id'] = self.post_id
+            event = (row['id'], self.feed.encode(row))
+            if len(self.history) == self.history.maxlen:
+                self.floor = self.history[0][0]
+            self.history.append(event)
+            self.last_id = row['id']
+            self.publish(event)
+
+        # Повний пакет — імовірно, є ще: не чекаємо наступного тіку
+        if len(rows) == self.feed.batch_limit:
+            self.wake.set()
+
+    def publish(self, event):
+        self.feed.stats['events'] += 1
+        for subscription in self.subscribers:
+            if not subscription.offer(event):
+                self.feed.stats['lagged'] += 1
+                subscription.reset()
+
+
+class CommentFeed:
+    """Живий потік коментарів для SSE в aiohttp
+
+    Для кожного поста з хоча б одним підписником працює рівно один
+    PostWatcher: він опитує БД раз на poll_ms і розсилає нові коментарі по
+    буферах підписників. Навантаження на БД залежить від кількості постів,
+    які дивляться, а не від кількості клієнтів. Клієнт, що не встигає
+    вичитувати свій буфер, отримує RESET замість нескінченного росту пам'яті.
+    cursor — async context manager з dict-курсором (AsyncBlogAPI.db_cursor).
+    """
+
+    def __init__(self, cursor, encode, poll_ms=1000, buffer_size=100, history_size=200, batch_limit=500):
+        self.cursor = cursor
+        self.encode = encode
+        self.poll_interval = poll_ms / 1000
+        self.buffer_size = buffer_size
+        self.history_size = history_size
+        self.batch_limit = batch_limit
+        self.watchers = {}
+        self.stats = {'polls': 0, 'events': 0, 'lagged': 0, 'errors': 0}
+
+    async def subscribe(self, post_id, after=None):
+        """Підписка на пост; в черзі спершу пропущене після after (або RESET)"""
+        watcher = self.watchers.get(post_id)
+        if watcher is None:
+            watcher = self.watchers[post_id] = PostWatcher(self, post_id)
+            watcher.start(after)
+
+        subscription = Subscription(post_id, self.buffer_size)
+        subscription.last_id = after or 0
+        watcher.subscribers.add(subscription)
+        try:
+            await asyncio.shield(watcher.ready)
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+
+        backlog = watcher.backlog(after)
+        if backlog is None or len(backlog) > self.buffer_size:
+            subscription.reset()
+        else:
+            for event in backlog:
+                subscription.offer(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        watcher = self.watchers.get(subscription.post_id)
+        if watcher is None:
+            return
+        watcher.subscribers.discard(subscription)
+        if not watcher.subscribers:
+            # Останній пішов — опитувач більше не потрібен
+            watcher.stop()
+            del self.watchers[subscription.post_id]
+
+    def notify(self, post_ids):
+        """Коментарі записано в цьому процесі — опитати ці пости негайно"""
+        for post_id in post_ids:
+            watcher = self.watchers.get(post_id)
+            if watcher is not None:
+                watcher.wake.set()
+
+    async def close(self, app=None):
+        for watcher in list(self.watchers.values()):
+            watcher.stop()
+        self.watchers.clear()
+
+    def snapshot(self):
+        return {
+            'watchers': len(self.watchers),
+            'subscribers': sum(len(watcher.subscribers) for watcher in self.watchers.values()),
+            **self.stats
+        }
+
+
+def format_event(event):
+    """Подія SSE з id для Last-Event-ID"""
+    event_id, data = event
+    return b'id: %d\nevent: comment\ndata: %s\n\n' % (event_id, data)
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from collections import namedtuple
+from contextlib import suppress
+from datetime import datetime
+
+logger = logging.getLogger('comment_writer')
+
+PendingComment = namedtuple('PendingComment', ['post_id', 'user_id', 'content', 'created_at', 'future'])
+
+INSERT_COMMENT = 'INSERT INTO comment (content, post_id, user_id, created_at, updated_at) VALUES '
+
+
+class CommentQueueFull(Exception):
+    """Черга коментарів заповнена — клієнт має повторити пізніше"""
+
+
+class PostNotFound(Exception):
+    """Коментар до поста, якого немає"""
+
+
+def _placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+class CommentWriter:
+    """Групова фіксація коментарів для aiohttp-сервера
+
+    Обробники кладуть коментарі в обмежену asyncio-чергу, фоновий писач
+    забирає їх пакетами (до batch_size штук або після flush_ms мілісекунд
+    від першого) і записує одним багаторядковим INSERT в одній транзакції
+    разом з оновленням версій постів. Обробник отримує відповідь лише після
+    commit пакета. transaction — async context manager, що дає курсор у
+    транзакції (AsyncBlogAPI.db_transaction). on_commit, якщо задано,
+    викликається з множиною id постів після кожного успішного commit —
+    вже після того, як обробники отримали результат.
+    """
+
+    def __init__(self, transaction, queue_size=10000, batch_size=500, flush_ms=5, on_commit=None):
+        self.transaction = transaction
+        self.on_commit = on_commit
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_delay = flush_ms / 1000
+        self.batch_ready = asyncio.Event()
+        self.task = None
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'rejected': 0, 'failed': 0}
+
+    async def start(self, app=None):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self, app=None, timeout=5):
+        """Дописати те, що вже в черзі, і зупинити писача"""
+        if self.task is None:
+            return
+
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.queue.join(), timeout)
+
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self.task = None
+
+        while not self.queue.empty():
+            self._fail(self.queue.get_nowait(), CommentQueueFull())
+
+    async def submit(self, post_id, user_id, content):
+        """Поставити коментар у чергу й дочекатися commit; повертає (id коментаря, розмір пакета)"""
+        item = PendingComment(post_id, user_id, content, datetime.utcnow(), asyncio.get_running_loop().create_future())
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise CommentQueueFull()
+
+        self.stats['queued'] += 1
+        if self.queue.qsize() >= self.batch_size:
+            self.batch_ready.set()
+
+        return await item.future
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+
+            # Чекаємо інших коментарів, доки не набереться пакет або не мине flush_delay
+            if self.queue.qsize() < self.batch_size - 1:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.batch_ready.wait(), self.flush_delay)
+            self.batch_ready.clear()
+
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                await self.write(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def write(self, batch):
+        try:
+            written = await self.flush(batch)
+        except asyncio.TimeoutError as e:
+            # Пул зайнятий — повторювати по одному немає сенсу
+            for item in batch:
+                self._fail(item, e)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return
+            # Один поганий рядок (напр. видалений автор) не має валити весь пакет
+            for item in batch:
+                await self.write([item])
+            return
+
+        self.stats['written'] += len(written)
+        self.stats['batches'] += 1
+        for item in batch:
+            if item in written:
+                if not item.future.done():
+                    item.future.set_result((written[item], len(batch)))
+            else:
+                self._fail(item, PostNotFound())
+
+        # Коментарі вже збережені: збій сповіщення не має ні валити писача, ні відповіді
+        if written and self.on_commit is not None:
+            try:
+                self.on_commit({item.post_id for item in written})
+            except Exception:
+                logger.exception('on_commit після запису коментарів завершився помилкою')
+
+    async def flush(self, batch):
+        """Записати пакет однією транзакцією; повертає {коментар: його id} для записаних"""
+        post_ids = sorted({item.post_id for item in batch})
+
+        async with self.transaction() as cursor:
+            await cursor.execute(f'SELECT id FROM post WHERE id IN ({_placeholders(post_ids)})', post_ids)
+            existing = {row['id'] for row in await cursor.fetchall()}
+
+            rows = [item for item in batch if item.post_id in existing]
+            if not rows:
+                return {}
+
+            # Один багаторядковий INSERT (не executemany, що може розбити пакет на кілька):
+            # id рядків одного такого INSERT ідуть поспіль від lastrowid
+            values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))
+            inserted = await cursor.execute(INSERT_COMMENT + values, [
+                value
+                for item in rows
+                for value in (item.content, item.post_id, item.user_id, item.created_at, item.created_at)
+            ])
+            if inserted != len(rows):
+                raise RuntimeError(f'Записано {inserted} коментарів з {len(rows)}')
+            first_id = cursor.lastrowid
+
+            # Нові валідатори для ETag та кешу фрагментів
+            touched = sorted(existing)
+            await cursor.execute(
+                f'UPDATE post SET updated_at = %s, version = version + 1 WHERE id IN ({_placeholders(touched)})',
+                [datetime.utcnow(), *touched]
+            )
+
+        return {item: first_id + offset for offset, item in enumerate(rows)}
+
+    def _fail(self, item, error):
+        self.stats['failed'] += 1
+        if not item.future.done():
+            item.future.set_exception(error)
@@ -0,0 +1,63 @@
+import hashlib
+from datetime import timezone
+# Без werkzeug: модуль імпортує й aiohttp-сервер
+from email.utils import parsedate_to_datetime, format_datetime
+
+
+def make_etag(*parts):
+    """Сильний ETag з валідаторів ресурсу (версії, дати оновлення, параметри запиту)"""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode('utf-8')).hexdigest() + '"'
+
+
+def to_http_datetime(value):
+    """Привести naive UTC datetime з БД до точності заголовка Last-Modified"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def etag_matches(if_none_match, etag):
+    """Перевірити заголовок If-None-Match"""
+    if not if_none_match:
+        return False
+
+    candidates = [item.strip() for item in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def parse_http_date(value):
+    """Розібрати дату з заголовка If-Modified-Since"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_not_modified(headers, etag, last_modified=None):
+    """Чи можна відповісти 304 замість повного тіла
+
+    If-None-Match має пріоритет над If-Modified-Since (RFC 9110).
+    """
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    since = parse_http_date(headers.get('If-Modified-Since'))
+    last_modified = to_http_datetime(last_modified)
+    return since is not None and last_modified is not None and last_modified <= since
+
+
+def validator_headers(etag, last_modified=None):
+    """Заголовки валідаторів для відповіді"""
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(to_http_datetime(last_modified), usegmt=True)
+    return headers
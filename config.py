@@ -2,12 +2,117 @@ import os
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here'
+    # Flask-JWT-Extended і так бере SECRET_KEY; явно — щоб aiohttp перевіряв ті самі токени
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
 
     # MySQL database configuration
     MYSQL_HOST = os.environ.get('MYSQL_HOST') or 'localhost'
+    MYSQL_PORT = int(os.environ.get('MYSQL_PORT') or 3306)
     MYSQL_USER = os.environ.get('MYSQL_USER') or 'admin'
     MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD') or '1234567890'
     MYSQL_DB = os.environ.get('MYSQL_DB') or 'flask_crud'
 
-    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    # DATABASE_URL дозволяє підмінити MySQL (напр. sqlite:///bench.db для бенчмарків)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
+        f'mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Репліки для читання через кому (напр. mysql+pymysql://...@replica1/flask_crud); порожньо — лише primary
+    DATABASE_REPLICA_URLS = os.environ.get('DATABASE_REPLICA_URLS') or ''
+    # Максимальне відставання репліки (с), період перевірки (с) та «липкість» primary після запису (с)
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG') or 5)
+    REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL') or 5)
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS') or 10)
+
+    # Пагінація постів
+    POSTS_PER_PAGE = int(os.environ.get('POSTS_PER_PAGE') or 20)
+    POSTS_MAX_PER_PAGE = int(os.environ.get('POSTS_MAX_PER_PAGE') or 100)
+    USERS_PER_PAGE = int(os.environ.get('USERS_PER_PAGE') or 20)
+    USERS_MAX_PER_PAGE = int(os.environ.get('USERS_MAX_PER_PAGE') or 100)
+
+
+    # Пул з'єднань aiomysql для aiohttp сервера
+    ASYNC_DB_POOL_MINSIZE = int(os.environ.get('ASYNC_DB_POOL_MINSIZE') or 1)
+    ASYNC_DB_POOL_MAXSIZE = int(os.environ.get('ASYNC_DB_POOL_MAXSIZE') or 10)
+    ASYNC_DB_ACQUIRE_TIMEOUT = float(os.environ.get('ASYNC_DB_ACQUIRE_TIMEOUT') or 5)
+    ASYNC_DB_POOL_RECYCLE = int(os.environ.get('ASYNC_DB_POOL_RECYCLE') or 3600)
+    # Скільки тримати результат об'єднаного GET після завершення (0 — лише одночасні запити)
+    COALESCE_CACHE_MS = float(os.environ.get('COALESCE_CACHE_MS') or 0)
+
+    # Групова фіксація коментарів в aiohttp (POST /api/async/posts/<id>/comments)
+    COMMENT_QUEUE_SIZE = int(os.environ.get('COMMENT_QUEUE_SIZE') or 10000)
+    COMMENT_BATCH_SIZE = int(os.environ.get('COMMENT_BATCH_SIZE') or 500)
+    COMMENT_FLUSH_MS = float(os.environ.get('COMMENT_FLUSH_MS') or 5)
+    COMMENT_RETRY_AFTER = int(os.environ.get('COMMENT_RETRY_AFTER') or 1)
+
+    # Живий потік коментарів (SSE, GET /api/async/posts/<id>/stream): один опитувач на пост
+    COMMENT_FEED_POLL_MS = float(os.environ.get('COMMENT_FEED_POLL_MS') or 1000)
+    COMMENT_FEED_CLIENT_BUFFER = int(os.environ.get('COMMENT_FEED_CLIENT_BUFFER') or 100)
+    COMMENT_FEED_HISTORY = int(os.environ.get('COMMENT_FEED_HISTORY') or 200)
+    COMMENT_FEED_HEARTBEAT = float(os.environ.get('COMMENT_FEED_HEARTBEAT') or 15)
+    COMMENT_FEED_RETRY_MS = int(os.environ.get('COMMENT_FEED_RETRY_MS') or 3000)
+    # Адреса aiohttp-сервера для сторінок Flask (порожньо — без живого потоку)
+    ASYNC_API_URL = os.environ.get('ASYNC_API_URL', 'http://localhost:8080')
+
+    # Зовнішні новини (GET /api/async/external/news): джерело, кеш і запобіжник
+    NEWS_API_URL = os.environ.get('NEWS_API_URL') or 'https://jsonplaceholder.typicode.com/posts'
+    NEWS_LIMIT = int(os.environ.get('NEWS_LIMIT') or 5)
+    NEWS_CACHE_TTL = float(os.environ.get('NEWS_CACHE_TTL') or 60)
+    NEWS_STALE_TTL = float(os.environ.get('NEWS_STALE_TTL') or 600)
+    NEWS_TIMEOUT = float(os.environ.get('NEWS_TIMEOUT') or 3)
+    NEWS_MAX_CONNECTIONS = int(os.environ.get('NEWS_MAX_CONNECTIONS') or 10)
+    NEWS_BREAKER_FAILURES = int(os.environ.get('NEWS_BREAKER_FAILURES') or 5)
+    NEWS_BREAKER_RESET = float(os.environ.get('NEWS_BREAKER_RESET') or 30)
+
+    # Повнотекстовий пошук: знімок індексу (JSON); порожньо — instance/search-index.json, off — без знімка
+    SEARCH_INDEX_SNAPSHOT = os.environ.get('SEARCH_INDEX_SNAPSHOT') or None
+    # Будувати індекс у фоні після першого запиту воркера (false — лише коли прийде пошук)
+    SEARCH_BUILD_ON_STARTUP = os.environ.get('SEARCH_BUILD_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+    # Як часто (секунди) підтягувати в індекс зміни інших воркерів та aiohttp-сервера
+    SEARCH_SYNC_INTERVAL = float(os.environ.get('SEARCH_SYNC_INTERVAL') or 5)
+    SEARCH_RETRY_AFTER = int(os.environ.get('SEARCH_RETRY_AFTER') or 5)
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS') or 50)
+
+    # Хешування паролів: метод з явною вартістю (напр. pbkdf2:sha256:600000 або scrypt:32768:8:1)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:600000'
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH') or 16)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT') or 32)
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 5)
+    PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER') or 1)
+
+    # Кеш ідентичності для JWT-обробників
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL') or 60)
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE') or 10000)
+    # Довіряти ролі з токена (без БД), ціною застарілої ролі до кінця дії токена
+    IDENTITY_TRUST_TOKEN_CLAIMS = os.environ.get('IDENTITY_TRUST_TOKEN_CLAIMS', '').lower() in ('1', 'true', 'yes')
+
+    # Максимум елементів в одному bulk-запиті
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS') or 1000)
+
+    # SQL-інструментація: Server-Timing та лог повільних запитів (логер sql.slow)
+    SQL_TIMING_ENABLED = os.environ.get('SQL_TIMING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS') or 100)
+    # Перевіряти бюджети SQL-запитів обробників (@query_budget) поза тестами, напр. на staging
+    QUERY_BUDGET_ENFORCE = os.environ.get('QUERY_BUDGET_ENFORCE', '').lower() in ('1', 'true', 'yes')
+
+    # Як довго показувати закешовані лічильники (напр. кількість користувачів на головній)
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL') or 60)
+
+    # Серіалізація JSON у відповідях API: auto (orjson, якщо встановлено), orjson або json
+    JSON_BACKEND = os.environ.get('JSON_BACKEND') or 'auto'
+
+    # Адаптивний ліміт одночасних API-запитів (окремо на кожен процес Flask та aiohttp)
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    ADMISSION_INITIAL_LIMIT = int(os.environ.get('ADMISSION_INITIAL_LIMIT') or 50)
+    ADMISSION_MIN_LIMIT = int(os.environ.get('ADMISSION_MIN_LIMIT') or 10)
+    ADMISSION_MAX_LIMIT = int(os.environ.get('ADMISSION_MAX_LIMIT') or 500)
+    # Зменшувати ліміт, коли p90 затримки перевищує базову в стільки разів
+    ADMISSION_LATENCY_TOLERANCE = float(os.environ.get('ADMISSION_LATENCY_TOLERANCE') or 2)
+    ADMISSION_BACKOFF = float(os.environ.get('ADMISSION_BACKOFF') or 0.9)
+    # Частка ліміту, недоступна дорогим маршрутам (логін, повні списки)
+    ADMISSION_CHEAP_RESERVE = float(os.environ.get('ADMISSION_CHEAP_RESERVE') or 0.2)
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER') or 1)
+
+    # Кеш фрагментів шаблонів (картки постів); 0 — вимкнено
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES') or 16 * 1024 * 1024)
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class CountCache:
+    """Закешовані COUNT(*) для сторінок, яким не потрібна точність до рядка
+
+    Значення перераховується не частіше ніж раз на COUNT_CACHE_TTL секунд;
+    створення та видалення в цьому процесі скидають його одразу.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 60
+        self.values = {}
+        self.lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config['COUNT_CACHE_TTL']
+
+    def get(self, name, compute):
+        with self.lock:
+            entry = self.values.get(name)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+
+        value = compute()
+        with self.lock:
+            self.values[name] = (value, time.monotonic() + self.ttl)
+        return value
+
+    def invalidate(self, name):
+        with self.lock:
+            self.values.pop(name, None)
+
+
+count_cache = CountCache()
@@ -0,0 +1,29 @@
+from flask import Flask
+from config import Config
+from models import db
+from hashing import password_hasher
+from replicas import replica_router
+
+
+def create_base_app(import_name=__name__):
+    """Мінімальний додаток: конфігурація, БД та хешування паролів
+
+    Достатньо скриптам і сідеру (init_db_auth.py, бенчмарки): без маршрутів,
+    JWT, REST API та Flask-Migrate. main.create_app будує повний додаток
+    поверх нього.
+    """
+    app = Flask(import_name)
+    app.config.from_object(Config)
+
+    # Бінди реплік — до створення рушіїв у db.init_app
+    replica_router.init_app(app)
+    db.init_app(app)
+    password_hasher.init_app(app)
+
+    return app
+
+
+def init_migrations(app):
+    """Flask-Migrate для команд flask db (імпорт alembic — сотні мілісекунд)"""
+    from flask_migrate import Migrate
+    return Migrate(app, db)
@@ -0,0 +1,88 @@
+from models import db, User, Post, Comment
+
+# Поля поста в канонічному порядку відповіді
+POST_FIELDS = ('id', 'title', 'content', 'excerpt', 'created_at', 'author', 'comments_count')
+# Відповідь списку без ?fields= (як до появи excerpt)
+POST_LIST_FIELDS = ('id', 'title', 'content', 'created_at', 'author', 'comments_count')
+POST_INCLUDES = ('author', 'comments')
+
+# Колонки, без яких не обійтися: id для зв'язків, created_at для курсора пагінації
+_ALWAYS_LOADED = (Post.id, Post.created_at)
+_FIELD_COLUMNS = {
+    'title': Post.title,
+    'content': Post.content,
+    'excerpt': Post.excerpt,
+    'author': Post.user_id
+}
+
+
+class InvalidFieldset(ValueError):
+    """Невідоме поле у ?fields= або зв'язок у ?include="""
+
+
+def parse_fieldset(value, allowed, default):
+    """'id,title' -> кортеж у порядку allowed; відсутній параметр -> default"""
+    if value is None:
+        return default
+
+    requested = {part.strip() for part in value.split(',') if part.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise InvalidFieldset(
+            f'Невідомі значення: {", ".join(sorted(unknown))} (доступні: {", ".join(allowed)})'
+        )
+    return tuple(name for name in allowed if name in requested)
+
+
+def post_query(fields, include):
+    """Запит постів, що читає з БД лише потрібні колонки та зв'язки
+
+    Автор (many-to-one) приєднується JOIN в тому ж запиті, коментарі з їхніми
+    авторами добираються одним selectin-запитом на всю сторінку.
+    """
+    columns = list(_ALWAYS_LOADED) + [_FIELD_COLUMNS[name] for name in fields if name in _FIELD_COLUMNS]
+    if 'author' in include:
+        columns.append(Post.user_id)
+
+    options = [db.load_only(*columns)]
+    if 'author' in fields or 'author' in include:
+        options.append(db.joinedload(Post.author).load_only(User.id, User.username))
+    if 'comments_count' in fields:
+        options.append(db.undefer(Post.comments_count))
+    if 'comments' in include:
+        options.append(
+            db.selectinload(Post.comments).joinedload(Comment.author).load_only(User.id, User.username)
+        )
+
+    return Post.query.options(*options)
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'content': comment.content,
+        'author': comment.author.username,
+        'created_at': comment.created_at.isoformat()
+    }
+
+
+def serialize_post(post, fields, include):
+    """Словник лише з запитаними полями та розгорнутими зв'язками
+
+    author завжди рядок (ім'я автора); ?include=author додає окремий об'єкт author_info.
+    """
+    result = {}
+    for name in fields:
+        if name == 'author':
+            result['author'] = post.author.username
+        elif name == 'created_at':
+            result['created_at'] = post.created_at.isoformat()
+        else:
+            result[name] = getattr(post, name)
+
+    if 'author' in include:
+        result['author_info'] = {'id': post.author.id, 'username': post.author.username}
+    if 'comments' in include:
+        result['comments'] = [serialize_comment(comment) for comment in post.comments]
+
+    return result
@@ -0,0 +1,125 @@
+import sys
+import threading
+from collections import OrderedDict
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+
+class FragmentCache:
+    """LRU-кеш відрендерених фрагментів шаблонів, обмежений за пам'яттю
+
+    Ключ — кортеж з аргументів тегу {% cache %}; перші два елементи (назва
+    фрагмента та id об'єкта) утворюють групу, яку можна скинути цілком,
+    незалежно від версії. Розмір рахується через sys.getsizeof рядків.
+    """
+
+    def __init__(self, app=None):
+        self.max_bytes = 16 * 1024 * 1024
+        self.entries = OrderedDict()
+        self.groups = {}
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_bytes = app.config['FRAGMENT_CACHE_MAX_BYTES']
+        app.jinja_env.add_extension(FragmentCacheExtension)
+        app.jinja_env.fragment_cache = self
+
+    def get_or_render(self, key, render):
+        if not self.max_bytes:
+            return render()
+
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Рендеримо поза блокуванням; паралельний промах лише перезапише той самий рядок
+        value = render()
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        cost = sys.getsizeof(value)
+        if cost > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = value
+            self.groups.setdefault(key[:2], set()).add(key)
+            self.size += cost
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.size -= sys.getsizeof(self.entries.pop(key))
+        group = self.groups.get(key[:2])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self.groups[key[:2]]
+
+    def invalidate(self, name, ident):
+        """Скинути всі версії фрагмента name для об'єкта ident"""
+        with self.lock:
+            for key in list(self.groups.get((name, ident), ())):
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.groups.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else None
+            }
+
+
+class FragmentCacheExtension(Extension):
+    """Тег {% cache 'назва', id, версія, ... %}...{% endcache %}"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render_cached', [nodes.List(parts)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        return self.environment.fragment_cache.get_or_render(tuple(parts), caller)
+
+
+fragment_cache = FragmentCache()
+
+
+def invalidate_post(post_id):
+    """Скинути закешовані картки поста (редагування, видалення, новий коментар)"""
+    fragment_cache.invalidate('post-card', post_id)
@@ -0,0 +1,122 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+
+
+class HashingBusy(ServiceUnavailable):
+    """Черга хешування паролів переповнена"""
+    description = 'Сервер перевантажений, спробуйте пізніше'
+
+
+def _generate(password, method, salt_length):
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _check(pwhash, password):
+    return check_password_hash(pwhash, password)
+
+
+def method_prefix(method):
+    """Метод у повному вигляді, як його записує werkzeug у хеш (scrypt -> scrypt:32768:8:1)"""
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+def _pool_context():
+    """Контекст multiprocessing для пулу хешування
+
+    Воркерам не мають діставатися з'єднання з БД та потоки батьківського процесу,
+    тому не fork. При spawn кожен воркер заново імпортує __main__ (як __mp_main__),
+    тому, де можливо, беремо forkserver: головний модуль імпортується один раз
+    у сервері, а воркери — його fork'и. Сам main.py застосунок при імпорті не будує.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['__main__', __name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class PasswordHasher:
+    """Хешування паролів в обмеженому пулі процесів
+
+    PBKDF2/scrypt займають CPU на десятки мілісекунд, тому виконуються поза
+    потоками запитів. Якщо в черзі вже забагато задач — одразу HashingBusy (503).
+    При PASSWORD_HASH_WORKERS = 0 хешування виконується в поточному потоці.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.method_prefix = DEFAULT_METHOD
+        self.salt_length = 16
+        self.workers = 0
+        self.queue_limit = 0
+        self.timeout = None
+        self.retry_after = 1
+        self.executor = None
+        self.slots = None
+        self.lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.method_prefix = method_prefix(self.method)
+        self.salt_length = app.config['PASSWORD_SALT_LENGTH']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_limit = app.config['PASSWORD_HASH_QUEUE_LIMIT']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self.retry_after = app.config['PASSWORD_HASH_RETRY_AFTER']
+
+        # Задачі, що виконуються, плюс задачі, що чекають у черзі
+        self.slots = threading.BoundedSemaphore(self.workers + self.queue_limit) if self.workers else None
+
+    def _get_executor(self):
+        if self.executor is None:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+        return self.executor
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        if not self.slots.acquire(blocking=False):
+            raise HashingBusy(retry_after=self.retry_after)
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        # Слот звільняється лише коли задача справді завершилась, навіть після таймауту
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy(retry_after=self.retry_after)
+
+    def hash(self, password):
+        """Згенерувати хеш пароля поточним методом"""
+        return self._run(_generate, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        """Перевірити пароль"""
+        return self._run(_check, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Чи створено хеш іншим методом або вартістю, ніж налаштовано зараз"""
+        return pwhash.split('$', 1)[0] != self.method_prefix
+
+    def shutdown(self, wait=False):
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
+
+
+password_hasher = PasswordHasher()
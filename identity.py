@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g, current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from werkzeug.exceptions import Unauthorized
+from models import db, User
+
+Identity = namedtuple('Identity', ['id', 'username', 'is_admin'])
+
+
+class IdentityCache:
+    """Кеш ідентичності користувача (id, username, is_admin) на рівні процесу
+
+    LRU з TTL: записи старші за IDENTITY_CACHE_TTL перечитуються з БД.
+    Інвалідація локальна для процесу, тож в інших воркерах зміна ролі
+    стане видимою не пізніше ніж через TTL.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 60
+        self.maxsize = 10000
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config['IDENTITY_CACHE_TTL']
+        self.maxsize = app.config['IDENTITY_CACHE_SIZE']
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None:
+                identity, expires_at = entry
+                if expires_at > time.monotonic():
+                    self.entries.move_to_end(user_id)
+                    self.hits += 1
+                    return identity
+                del self.entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, identity):
+        with self.lock:
+            self.entries[identity.id] = (identity, time.monotonic() + self.ttl)
+            self.entries.move_to_end(identity.id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Скинути запис після зміни або видалення користувача"""
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else None
+            }
+
+
+identity_cache = IdentityCache()
+
+
+def identity_claims(user):
+    """Додаткові claims для токена (роль без звернення до БД)"""
+    return {'username': user.username, 'is_admin': user.is_admin}
+
+
+def load_identity(user_id):
+    """Ідентичність з кешу процесу або одним легким запитом до БД"""
+    identity = identity_cache.get(user_id)
+    if identity is not None:
+        return identity
+
+    row = db.session.query(User.id, User.username, User.is_admin).filter_by(id=user_id).first()
+    if row is None:
+        return None
+
+    identity = Identity(row.id, row.username, bool(row.is_admin))
+    identity_cache.set(identity)
+    return identity
+
+
+def current_identity():
+    """Поточний користувач для @jwt_required обробників
+
+    Спочатку кеш запиту (g), потім — claims токена (якщо IDENTITY_TRUST_TOKEN_CLAIMS),
+    далі кеш процесу і лише в останню чергу БД.
+    """
+    identity = g.get('current_identity')
+    if identity is not None:
+        return identity
+
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+    if current_app.config['IDENTITY_TRUST_TOKEN_CLAIMS'] and 'is_admin' in claims:
+        identity = Identity(user_id, claims.get('username'), bool(claims['is_admin']))
+    else:
+        identity = load_identity(user_id)
+
+    if identity is None:
+        raise Unauthorized('Користувача не знайдено')
+
+    g.current_identity = identity
+    return identity
@@ -0,0 +1,71 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # orjson необов'язковий: без нього працює stdlib json
+    orjson = None
+
+BACKENDS = ('auto', 'orjson', 'json')
+
+
+def default(value):
+    """Типи поза JSON: дати (для stdlib), Decimal, UUID, рядки SQLAlchemy (Row)"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+
+    mapping = getattr(value, '_mapping', None)
+    if mapping is not None:
+        return dict(mapping)
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class JSONCodec:
+    """Серіалізація відповідей API через orjson (якщо встановлено) або stdlib json
+
+    Обидва бекенди дають однаковий JSON: datetime у форматі isoformat(),
+    Decimal рядком, UTF-8 без \\u-екранування, без пробілів.
+    """
+
+    def __init__(self, backend='auto'):
+        self.configure(backend)
+
+    def init_app(self, app):
+        self.configure(app.config['JSON_BACKEND'])
+
+    def configure(self, backend):
+        if backend not in BACKENDS:
+            raise ValueError(f'Невідомий JSON_BACKEND "{backend}" (доступні: {", ".join(BACKENDS)})')
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'json'
+        if backend == 'orjson' and orjson is None:
+            raise RuntimeError('JSON_BACKEND=orjson, але пакет orjson не встановлено')
+        self.backend = backend
+
+    def dumps(self, obj):
+        """Серіалізувати в bytes (UTF-8)"""
+        if self.backend == 'orjson':
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+json_codec = JSONCodec()
+
+
+def output_json(data, code, headers=None):
+    """Представлення application/json для Flask-RESTful"""
+    from flask import make_response
+
+    response = make_response(json_codec.dumps(data), code)
+    response.headers.extend(headers or {})
+    return response
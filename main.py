@@ -1,54 +1,118 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-from flask_wtf.csrf import CSRFProtect
-from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
-from config import Config
-from models import db, User, Post, Comment
+import threading
+import click
+from flask import render_template, request, redirect, url_for, flash, session, jsonify, abort, current_app
+from factory import create_base_app, init_migrations
+from models import db, User, Post, Comment, ListVersion
 from forms import LoginForm, RegistrationForm, PostForm, CommentForm, UserForm
-from api import init_api
+from search import search_index
+from identity import identity_cache
+from fragment_cache import fragment_cache, invalidate_post
+from counters import count_cache
+from pagination import paginate_keyset, parse_limit, InvalidCursor
+from query_budget import query_budget
+from replicas import replica_reads
+from admission import admission_control
+
+
+# Веб-маршрути збираються при імпорті, а додаються до app у create_app
+VIEWS = []
+
+
+def route(rule, **options):
+    """Як app.route, але без готового app: маршрут зареєструє create_app"""
+    def decorator(view):
+        VIEWS.append((rule, view, options))
+        return view
+    return decorator
 
 
 def create_app():
     """Фабрика додатків Flask"""
-    app = Flask(__name__)
-    app.config.from_object(Config)
+    # JWT, REST API, CLI та SQL-інструментація імпортуються лише тут, коли додаток справді будується
+    from flask_jwt_extended import JWTManager
+    from api import init_api
+    from cli import register_commands
+    from sql_timing import init_sql_timing
+
+    app = create_base_app(__name__)
 
     # Ініціалізація розширень
-    db.init_app(app)
+    identity_cache.init_app(app)
+    fragment_cache.init_app(app)
+    count_cache.init_app(app)
 
     # Для навчального проекту можна відключити CSRF
     # csrf = CSRFProtect(app)
 
     jwt = JWTManager(app)
-    migrate = Migrate(app, db)
+    register_jwt_handlers(jwt)
+    # Flask-Migrate потрібен лише командам flask db: воркери не платять за імпорт alembic
+    migrate = init_migrations(app) if click.get_current_context(silent=True) is not None else None
 
     # Ініціалізація API
     api = init_api(app)
 
+    # CLI-команди (flask export / flask import)
+    register_commands(app)
+
+    # Server-Timing та лог повільних SQL-запитів
+    init_sql_timing(app)
+
+    # Швидкий 503 для API-запитів понад адаптивний ліміт
+    admission_control.init_app(app)
+
+    # Пошуковий індекс будується у фоні після першого запиту воркера
+    search_index.init_app(app)
+
+    for rule, view, options in VIEWS:
+        app.add_url_rule(rule, view_func=view, **options)
+
     return app, None, jwt, migrate, api
 
 
-app, csrf, jwt, migrate, api = create_app()
+_app = None
+_app_lock = threading.Lock()
 
 
-# JWT обробники помилок
-@jwt.expired_token_loader
-def expired_token_callback(jwt_header, jwt_payload):
-    return jsonify({'message': 'Токен прострочений'}), 401
+def get_app():
+    """Повний додаток процесу; будується при першому зверненні, а не при імпорті main
 
+    Імпорт main без побудови потрібен дочірнім процесам multiprocessing
+    (spawn імпортує головний модуль як __mp_main__) та скриптам.
+    """
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()[0]
+    return _app
+
+
+def __getattr__(name):
+    # main.app для gunicorn main:app, flask --app main та тестів
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def register_jwt_handlers(jwt):
+    """JWT обробники помилок"""
 
-@jwt.invalid_token_loader
-def invalid_token_callback(error):
-    return jsonify({'message': 'Невідомий токен'}), 401
+    @jwt.expired_token_loader
+    def expired_token_callback(jwt_header, jwt_payload):
+        return jsonify({'message': 'Токен прострочений'}), 401
 
+    @jwt.invalid_token_loader
+    def invalid_token_callback(error):
+        return jsonify({'message': 'Невідомий токен'}), 401
 
-@jwt.unauthorized_loader
-def missing_token_callback(error):
-    return jsonify({'message': 'Потрібна авторизація'}), 401
+    @jwt.unauthorized_loader
+    def missing_token_callback(error):
+        return jsonify({'message': 'Потрібна авторизація'}), 401
 
 
 # Веб-маршрути з Flask-WTF
-@app.route('/login', methods=['GET', 'POST'])
+@route('/login', methods=['GET', 'POST'])
 def login():
     """Авторизація з Flask-WTF"""
     form = LoginForm()
@@ -60,6 +124,8 @@ def login():
         user = User.query.filter_by(email=email).first()
 
         if user and user.check_password(password):
+            # Зберегти перерахований хеш, якщо метод змінився
+            db.session.commit()
             session['current_user'] = {
                 'id': user.id,
                 'username': user.username,
@@ -74,7 +140,7 @@ def login():
     return render_template('login_wtf.html', form=form)
 
 
-@app.route('/register', methods=['GET', 'POST'])
+@route('/register', methods=['GET', 'POST'])
 def register():
     """Реєстрація з Flask-WTF"""
     form = RegistrationForm()
@@ -92,6 +158,7 @@ def register():
 
         db.session.add(user)
         db.session.commit()
+        count_cache.invalidate('users')
 
         flash('Реєстрація успішна!', 'success')
         return redirect(url_for('login'))
@@ -99,18 +166,48 @@ def register():
     return render_template('register_wtf.html', form=form)
 
 
-@app.route('/')
+@route('/')
+@query_budget(3)
 def index():
-    """Головна сторінка"""
+    """Головна сторінка (вартість не залежить від кількості користувачів)"""
     if 'current_user' not in session:
         return redirect(url_for('login'))
 
-    users = User.query.all()
-    posts = Post.query.order_by(Post.created_at.desc()).limit(5).all()
-    return render_template('index.html', users=users, posts=posts)
+    users = User.query.order_by(User.created_at.desc(), User.id.desc()).limit(5).all()
+    users_total = count_cache.get('users', User.total_count)
+    posts = Post.listing_query().order_by(Post.created_at.desc()).limit(5).all()
+    return render_template('index.html', users=users, users_total=users_total, posts=posts)
 
 
-@app.route('/posts/create', methods=['GET', 'POST'])
+@route('/users/directory')
+@query_budget(1)
+def user_directory():
+    """Сторінка довідника користувачів (JSON для підвантаження на головній)"""
+    if 'current_user' not in session:
+        return jsonify({'message': 'Потрібна авторизація'}), 401
+
+    limit = parse_limit(
+        request.args.get('limit'),
+        current_app.config['USERS_PER_PAGE'],
+        current_app.config['USERS_MAX_PER_PAGE']
+    )
+
+    try:
+        users, next_cursor = paginate_keyset(User.query, User, request.args.get('cursor'), limit)
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify({
+        'users': [{
+            'id': user.id,
+            'username': user.username,
+            'created_at': user.created_at.isoformat()
+        } for user in users],
+        'next_cursor': next_cursor
+    })
+
+
+@route('/posts/create', methods=['GET', 'POST'])
 def create_post():
     """Створення поста з Flask-WTF"""
     if 'current_user' not in session:
@@ -125,7 +222,9 @@ def create_post():
             user_id=session['current_user']['id']
         )
         db.session.add(post)
+        ListVersion.bump('posts')
         db.session.commit()
+        search_index.index_post(post)
 
         flash('Пост створено!', 'success')
         return redirect(url_for('posts'))
@@ -133,30 +232,45 @@ def create_post():
     return render_template('create_post_wtf.html', form=form)
 
 
-@app.route('/posts')
+@route('/posts')
+@replica_reads
+@query_budget(1)
 def posts():
     """Список постів"""
     if 'current_user' not in session:
         return redirect(url_for('login'))
 
-    posts = Post.query.order_by(Post.created_at.desc()).all()
-    return render_template('posts.html', posts=posts)
+    limit = parse_limit(
+        request.args.get('limit'),
+        current_app.config['POSTS_PER_PAGE'],
+        current_app.config['POSTS_MAX_PER_PAGE']
+    )
+
+    try:
+        posts, next_cursor = paginate_keyset(Post.listing_query(), Post, request.args.get('cursor'), limit)
+    except InvalidCursor:
+        abort(400)
 
+    return render_template('posts.html', posts=posts, next_cursor=next_cursor, limit=limit)
 
-@app.route('/posts/<int:id>')
+
+@route('/posts/<int:id>')
+@replica_reads
+@query_budget(2)
 def view_post(id):
     """Перегляд поста з коментарями"""
     if 'current_user' not in session:
         return redirect(url_for('login'))
 
-    post = Post.query.get_or_404(id)
-    comments = Comment.query.filter_by(post_id=id).order_by(Comment.created_at.desc()).all()
+    post = Post.query.options(db.joinedload(Post.author)).get_or_404(id)
+    comments = Comment.query.options(db.joinedload(Comment.author)) \
+        .filter_by(post_id=id).order_by(Comment.created_at.desc()).all()
     form = CommentForm()
 
     return render_template('view_post_wtf.html', post=post, comments=comments, form=form)
 
 
-@app.route('/comments/create/<int:post_id>', methods=['POST'])
+@route('/comments/create/<int:post_id>', methods=['POST'])
 def create_comment(post_id):
     """Створення коментаря з Flask-WTF"""
     if 'current_user' not in session:
@@ -171,13 +285,15 @@ def create_comment(post_id):
             user_id=session['current_user']['id']
         )
         db.session.add(comment)
+        Post.touch_by_id(post_id)
         db.session.commit()
+        invalidate_post(post_id)
         flash('Коментар додано!', 'success')
 
     return redirect(url_for('view_post', id=post_id))
 
 
-@app.route('/logout')
+@route('/logout')
 def logout():
     """Вихід з системи"""
     session.clear()
@@ -185,7 +301,7 @@ def logout():
     return redirect(url_for('login'))
 
 
-@app.route('/api-docs')
+@route('/api-docs')
 def api_docs():
     """Документація API"""
     return """
@@ -193,14 +309,18 @@ def api_docs():
     <h2>Endpoints:</h2>
     <ul>
         <li><strong>POST /api/auth/login</strong> - Авторизація</li>
-        <li><strong>GET /api/users</strong> - Список користувачів (адмін)</li>
+        <li><strong>GET /api/users?limit=&amp;cursor=</strong> - Список користувачів (адмін, курсорна пагінація)</li>
         <li><strong>POST /api/users</strong> - Створити користувача (адмін)</li>
         <li><strong>GET /api/users/{id}</strong> - Інформація про користувача</li>
         <li><strong>PUT /api/users/{id}</strong> - Оновити користувача</li>
         <li><strong>DELETE /api/users/{id}</strong> - Видалити користувача (адмін)</li>
-        <li><strong>GET /api/posts</strong> - Список постів</li>
+        <li><strong>GET /api/posts?limit=&amp;cursor=&amp;fields=&amp;include=</strong> - Список постів (курсорна пагінація, next_cursor; fields=id,title,content,created_at,author,comments_count; include=author,comments; author — ім'я, include=author додає об'єкт author_info)</li>
         <li><strong>POST /api/posts</strong> - Створити пост</li>
-        <li><strong>GET /api/posts/{id}</strong> - Пост з коментарями</li>
+        <li><strong>GET /api/posts/search?q=</strong> - Повнотекстовий пошук постів</li>
+        <li><strong>POST /api/posts/bulk</strong> - Створити пости пакетом</li>
+        <li><strong>DELETE /api/posts/bulk</strong> - Видалити пости пакетом</li>
+        <li><strong>POST /api/comments/bulk</strong> - Створити коментарі пакетом</li>
+        <li><strong>GET /api/posts/{id}?fields=&amp;include=</strong> - Пост з коментарями (include=comments за замовчуванням)</li>
         <li><strong>PUT /api/posts/{id}</strong> - Оновити пост</li>
         <li><strong>DELETE /api/posts/{id}</strong> - Видалити пост</li>
     </ul>
@@ -210,6 +330,8 @@ def api_docs():
     <ul>
         <li><strong>GET localhost:8080/api/async/posts</strong> - Асинхронні пости</li>
         <li><strong>GET localhost:8080/api/async/users</strong> - Асинхронні користувачі</li>
+        <li><strong>POST localhost:8080/api/async/posts/{id}/comments</strong> - Коментар з груповою фіксацією (JWT)</li>
+        <li><strong>GET localhost:8080/api/async/posts/{id}/stream</strong> - Нові коментарі наживо (Server-Sent Events)</li>
         <li><strong>GET localhost:8080/api/async/external/news</strong> - Зовнішній API</li>
     </ul>
     """
@@ -224,6 +346,7 @@ def start_aiohttp_server():
 
 
 if __name__ == '__main__':
+    app = get_app()
     with app.app_context():
         db.create_all()
 
@@ -249,9 +372,13 @@ if __name__ == '__main__':
     print("  - Aiohttp сервер: python aiohttp_server.py (localhost:8080)")
     print("=" * 50)
     print("⚡ Міграції:")
-    print("  flask db init")
-    print("  flask db migrate -m 'Initial migration'")
+    print("  flask db migrate -m 'назва'")
     print("  flask db upgrade")
+    print("  flask explain-check (плани гарячих запитів)")
+    print("=" * 50)
+    print("💾 Резервні копії:")
+    print("  flask export backup.ndjson")
+    print("  flask import backup.ndjson")
     print("=" * 50)
 
     # Можна запустити aiohttp в окремому потоці
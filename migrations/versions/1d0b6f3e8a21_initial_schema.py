@@ -0,0 +1,72 @@
+"""Початкова схема: user, post, comment
+
+Revision ID: 1d0b6f3e8a21
+Revises:
+Create Date: 2025-01-06 12:00:00.000000
+
+Таблиці в тому вигляді, в якому їх створював db.create_all до появи
+міграцій. БД, створена через create_all, вже має їх — такі таблиці
+пропускаються, а наступні ревізії додають лише те, чого бракує.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d0b6f3e8a21'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = existing_tables()
+
+    if 'user' not in tables:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(80), nullable=False),
+            sa.Column('email', sa.String(120), nullable=False),
+            sa.Column('password_hash', sa.String(255), nullable=False),
+            sa.Column('is_admin', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('username'),
+            sa.UniqueConstraint('email')
+        )
+
+    if 'post' not in tables:
+        op.create_table(
+            'post',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(100), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'comment' not in tables:
+        op.create_table(
+            'comment',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('post_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['post_id'], ['post.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('comment')
+    op.drop_table('post')
+    op.drop_table('user')
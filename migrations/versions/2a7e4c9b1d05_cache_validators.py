@@ -0,0 +1,44 @@
+"""Валідатори кешу: updated_at та version
+
+Revision ID: 2a7e4c9b1d05
+Revises: 1d0b6f3e8a21
+Create Date: 2025-01-13 12:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a7e4c9b1d05'
+down_revision = '1d0b6f3e8a21'
+branch_labels = None
+depends_on = None
+
+TABLES = ['user', 'post', 'comment']
+
+
+def existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    now = datetime.utcnow()
+    for table in TABLES:
+        if 'updated_at' not in existing_columns(table):
+            # SQLite не додає колонку з DEFAULT CURRENT_TIMESTAMP — заповнюємо окремим UPDATE
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+            rows = sa.table(table, sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime))
+            op.execute(rows.update().values(updated_at=sa.func.coalesce(rows.c.created_at, now)))
+
+    if 'version' not in existing_columns('post'):
+        op.add_column('post', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.drop_column('version')
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
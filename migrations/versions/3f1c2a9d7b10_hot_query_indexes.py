@@ -0,0 +1,43 @@
+"""Індекси під гарячі запити
+
+Revision ID: 3f1c2a9d7b10
+Revises: 2a7e4c9b1d05
+Create Date: 2025-01-20 12:00:00.000000
+
+Додаються лише індекси, яких ще немає: БД, створена через db.create_all
+(init_db_auth.py, flask seed), вже має їх з моделей.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = '2a7e4c9b1d05'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_user_created_at', 'user', ['created_at']),
+    ('ix_post_created_at_id', 'post', ['created_at', 'id']),
+    ('ix_post_user_id_created_at', 'post', ['user_id', 'created_at']),
+    ('ix_post_updated_at', 'post', ['updated_at']),
+    ('ix_comment_post_id_created_at', 'comment', ['post_id', 'created_at']),
+    ('ix_comment_user_id_created_at', 'comment', ['user_id', 'created_at']),
+]
+
+
+def existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        if name not in existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        if name in existing_indexes(table):
+            op.drop_index(name, table_name=table)
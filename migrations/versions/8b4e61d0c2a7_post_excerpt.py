@@ -0,0 +1,38 @@
+"""Збережений уривок поста для списків
+
+Revision ID: 8b4e61d0c2a7
+Revises: 3f1c2a9d7b10
+Create Date: 2025-01-27 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e61d0c2a7'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+# Має збігатися з models.EXCERPT_LENGTH на момент міграції
+EXCERPT_LENGTH = 150
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('post')}
+    if 'excerpt' not in columns:
+        op.add_column('post', sa.Column('excerpt', sa.String(EXCERPT_LENGTH), nullable=False, server_default=''))
+
+    # Заповнюємо існуючі пости одним UPDATE на стороні БД
+    post = sa.table('post', sa.column('content', sa.Text), sa.column('excerpt', sa.String))
+    op.execute(
+        post.update()
+        .where(post.c.excerpt == '')
+        .values(excerpt=sa.func.substr(post.c.content, 1, EXCERPT_LENGTH))
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.drop_column('excerpt')
@@ -0,0 +1,32 @@
+"""Індекс під курсор живого потоку коментарів
+
+Revision ID: c5d9e27a4f13
+Revises: 8b4e61d0c2a7
+Create Date: 2025-02-03 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d9e27a4f13'
+down_revision = '8b4e61d0c2a7'
+branch_labels = None
+depends_on = None
+
+NAME = 'ix_comment_post_id_id'
+
+
+def existing_indexes():
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('comment')}
+
+
+def upgrade():
+    if NAME not in existing_indexes():
+        op.create_index(NAME, 'comment', ['post_id', 'id'])
+
+
+def downgrade():
+    if NAME in existing_indexes():
+        op.drop_index(NAME, table_name='comment')
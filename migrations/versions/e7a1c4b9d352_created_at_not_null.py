@@ -0,0 +1,35 @@
+"""created_at NOT NULL: курсори пагінації спираються на created_at
+
+Revision ID: e7a1c4b9d352
+Revises: c5d9e27a4f13
+Create Date: 2025-02-10 12:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a1c4b9d352'
+down_revision = 'c5d9e27a4f13'
+branch_labels = None
+depends_on = None
+
+TABLES = ['user', 'post', 'comment']
+
+
+def upgrade():
+    now = datetime.utcnow()
+    for table in TABLES:
+        # Рядки без дати (вставлені в обхід ORM) отримують час міграції
+        rows = sa.table(table, sa.column('created_at', sa.DateTime))
+        op.execute(rows.update().where(rows.c.created_at.is_(None)).values(created_at=now))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
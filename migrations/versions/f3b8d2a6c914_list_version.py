@@ -0,0 +1,33 @@
+"""Таблиця list_version: валідатори списку постів без COUNT(*)
+
+Revision ID: f3b8d2a6c914
+Revises: e7a1c4b9d352
+Create Date: 2025-02-17 12:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2a6c914'
+down_revision = 'e7a1c4b9d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'list_version' not in sa.inspect(op.get_bind()).get_table_names():
+        table = op.create_table(
+            'list_version',
+            sa.Column('name', sa.String(40), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+        op.bulk_insert(table, [{'name': 'posts', 'version': 0, 'updated_at': datetime.utcnow()}])
+
+
+def downgrade():
+    op.drop_table('list_version')
@@ -1,8 +1,19 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from hashing import password_hasher
+from replicas import RoutingSession
 
-db = SQLAlchemy()
+# Сесія з маршрутизацією читань на репліки (replicas.replica_router)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Довжина збереженого уривка поста для списків
+EXCERPT_LENGTH = 150
+
+
+def make_excerpt(content):
+    """Уривок для Post.excerpt (також для пакетних вставок в обхід ORM)"""
+    return (content or '')[:EXCERPT_LENGTH]
 
 
 class User(db.Model):
@@ -12,7 +23,12 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_user_created_at', 'created_at'),
+    )
 
     # Зв'язки
     posts = db.relationship('Post', backref='author', lazy=True, cascade='all, delete-orphan')
@@ -20,11 +36,22 @@ class User(db.Model):
 
     def set_password(self, password):
         """Встановити пароль"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        """Перевірити пароль"""
-        return check_password_hash(self.password_hash, password)
+        """Перевірити пароль (застарілий хеш перераховується поточним методом)"""
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+
+        # Зберігається разом з наступним commit
+        if password_hasher.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
+
+    @classmethod
+    def total_count(cls):
+        """Кількість користувачів одним COUNT без завантаження рядків"""
+        return db.session.query(db.func.count(cls.id)).scalar()
 
     def to_dict(self):
         """Конвертувати в словник для API"""
@@ -45,12 +72,93 @@ class Post(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Списки читають лише уривок, а не весь Text
+    excerpt = db.Column(db.String(EXCERPT_LENGTH), nullable=False, default='', server_default='')
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    # Індекси під гарячі запити (див. query_plans.py та flask explain-check)
+    __table_args__ = (
+        db.Index('ix_post_created_at_id', 'created_at', 'id'),
+        db.Index('ix_post_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_post_updated_at', 'updated_at'),
+    )
+
     # Зв'язки
     comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan')
 
+    @validates('content')
+    def sync_excerpt(self, key, content):
+        """Оновлювати уривок при кожній зміні змісту через ORM"""
+        self.excerpt = make_excerpt(content)
+        return content
+
+    @classmethod
+    def listing_query(cls):
+        """Запит для списків: автор через JOIN, кількість коментарів підзапитом, без content"""
+        return cls.query.options(
+            db.joinedload(cls.author),
+            db.undefer(cls.comments_count),
+            db.defer(cls.content)
+        )
+
+    @classmethod
+    def detail_query(cls):
+        """Запит для перегляду поста: коментарі з авторами одним додатковим запитом"""
+        return cls.query.options(
+            db.joinedload(cls.author),
+            db.selectinload(cls.comments).joinedload(Comment.author)
+        )
+
+    def touch(self):
+        """Оновити валідатори кешу (updated_at, version) після зміни"""
+        self.updated_at = datetime.utcnow()
+        self.version = Post.version + 1
+
+    @classmethod
+    def touch_by_id(cls, post_id):
+        """Оновити валідатори поста без його завантаження (напр. при новому коментарі)"""
+        cls.touch_by_ids([post_id])
+
+    @classmethod
+    def touch_by_ids(cls, post_ids):
+        """Оновити валідатори кількох постів одним UPDATE"""
+        cls.query.filter(cls.id.in_(list(post_ids))).update(
+            {cls.updated_at: datetime.utcnow(), cls.version: cls.version + 1},
+            synchronize_session=False
+        )
+
+    @classmethod
+    def touch_by_user(cls, user_id):
+        """Оновити валідатори постів, у яких видно ім'я користувача (автор або коментатор)
+
+        Повертає id зачеплених постів.
+        """
+        commented = db.select(Comment.post_id).where(Comment.user_id == user_id)
+        post_ids = [
+            row.id for row in
+            db.session.query(cls.id).filter(db.or_(cls.user_id == user_id, cls.id.in_(commented)))
+        ]
+        if post_ids:
+            cls.touch_by_ids(post_ids)
+        return post_ids
+
+    @classmethod
+    def list_validators(cls):
+        """Версія списку та остання зміна — для ETag та Last-Modified списку
+
+        Обидва значення читаються за індексом (рядок list_version та MAX по
+        ix_post_updated_at), без COUNT по всій таблиці.
+        """
+        version, changed_at, last_updated = db.session.execute(db.select(
+            ListVersion.current('posts', ListVersion.version),
+            ListVersion.current('posts', ListVersion.updated_at),
+            db.select(db.func.max(cls.updated_at)).scalar_subquery()
+        )).one()
+        return version, max(filter(None, (changed_at, last_updated)), default=None)
+
     def to_dict(self, include_comments=False):
         """Конвертувати в словник для API"""
         result = {
@@ -59,7 +167,7 @@ class Post(db.Model):
             'content': self.content,
             'created_at': self.created_at.isoformat(),
             'author': self.author.username,
-            'comments_count': len(self.comments)
+            'comments_count': len(self.comments) if include_comments else self.comments_count
         }
 
         if include_comments:
@@ -75,10 +183,18 @@ class Comment(db.Model):
     """Модель коментаря"""
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_comment_post_id_created_at', 'post_id', 'created_at'),
+        # Курсор живого потоку коментарів: post_id = ? AND id > ? ORDER BY id
+        db.Index('ix_comment_post_id_id', 'post_id', 'id'),
+        db.Index('ix_comment_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     def to_dict(self):
         """Конвертувати в словник для API"""
         return {
@@ -90,4 +206,43 @@ class Comment(db.Model):
         }
 
     def __repr__(self):
-        return f'<Comment {self.id}>'
\ No newline at end of file
+        return f'<Comment {self.id}>'
+
+
+class ListVersion(db.Model):
+    """Версія списку для валідаторів кешу
+
+    Зростає при змінах, яких не видно в MAX(updated_at) елементів: видалення,
+    імпорт зі старими датами, перейменування автора.
+    """
+    __tablename__ = 'list_version'
+
+    name = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def current(cls, name, column):
+        """Скалярний підзапит для колонки рядка name"""
+        return db.select(column).where(cls.name == name).scalar_subquery()
+
+    @classmethod
+    def bump(cls, name):
+        """Збільшити версію в поточній транзакції (рядок створюється при першій зміні)"""
+        now = datetime.utcnow()
+        updated = cls.query.filter_by(name=name).update(
+            {cls.version: cls.version + 1, cls.updated_at: now},
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.add(cls(name=name, version=1, updated_at=now))
+
+
+# Кількість коментарів як відкладений підзапит, щоб не завантажувати колекцію
+Post.comments_count = db.column_property(
+    db.select(db.func.count(Comment.id))
+    .where(Comment.post_id == Post.id)
+    .correlate_except(Comment)
+    .scalar_subquery(),
+    deferred=True
+)
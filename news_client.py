@@ -0,0 +1,168 @@
+import asyncio
+import time
+from contextlib import suppress
+import aiohttp
+
+
+class CircuitOpen(Exception):
+    """Запобіжник розімкнено — до джерела не звертаємось"""
+
+    def __init__(self, retry_after):
+        super().__init__('Зовнішнє джерело тимчасово недоступне')
+        self.retry_after = retry_after
+
+
+class UpstreamError(Exception):
+    """Зовнішнє джерело відповіло помилкою або не вклалося в таймаут"""
+
+
+class CircuitBreaker:
+    """Запобіжник: після failure_threshold помилок поспіль — reset_timeout секунд тиші
+
+    Після паузи пропускається одна пробна спроба (half-open): успіх замикає
+    запобіжник, помилка знову розмикає.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def before_call(self):
+        """CircuitOpen, якщо звертатися зараз не можна"""
+        if self.opened_at is None:
+            return
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        if remaining > 0 or self.probing:
+            raise CircuitOpen(max(1, int(remaining + 0.999)))
+        self.probing = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release_probe(self):
+        """Пробну спробу перервано без результату — наступна знову може пройти"""
+        self.probing = False
+
+
+class NewsClient:
+    """Клієнт зовнішнього API новин для aiohttp-сервера
+
+    Одна довгоживуча ClientSession з обмеженням з'єднань і таймаутами замість
+    сесії на кожен запит. Відповідь кешується на ttl секунд; ще stale_ttl
+    секунд після цього віддається застаріла копія, а оновлення йде у фоні
+    (stale-while-revalidate). Одночасно виконується не більше одного
+    оновлення, а джерело прикрите CircuitBreaker.
+    """
+
+    def __init__(self, url, limit=5, ttl=60, stale_ttl=600, timeout=3, max_connections=10, breaker=None):
+        self.url = url
+        self.limit = limit
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_connections = max_connections
+        self.breaker = breaker or CircuitBreaker()
+        self.session = None
+        self.cached = None
+        self.fetched_at = None
+        self.refreshing = None
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'failures': 0, 'rejected': 0}
+
+    async def start(self, app=None):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self, app=None):
+        if self.refreshing is not None:
+            self.refreshing.cancel()
+            with suppress(BaseException):
+                await self.refreshing
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get(self):
+        """(новини, stale); CircuitOpen / UpstreamError, якщо віддати нічого"""
+        age = time.monotonic() - self.fetched_at if self.fetched_at is not None else None
+
+        if age is not None and age < self.ttl:
+            self.stats['hits'] += 1
+            return self.cached, False
+
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self.stats['stale_hits'] += 1
+            self.refresh()
+            return self.cached, True
+
+        self.stats['misses'] += 1
+        return await asyncio.shield(self.refresh()), False
+
+    def refresh(self):
+        """Задача оновлення кешу (спільна, якщо вже виконується)"""
+        if self.refreshing is None:
+            self.refreshing = asyncio.ensure_future(self.fetch())
+            self.refreshing.add_done_callback(self._refreshed)
+        return self.refreshing
+
+    def _refreshed(self, task):
+        self.refreshing = None
+        if task.cancelled():
+            # Скасування (напр. close) не успіх і не помилка джерела: інакше half-open завис би назавжди
+            self.breaker.release_probe()
+            return
+        # Фонове оновлення ніхто не чекає — помилку вже пораховано в stats
+        task.exception()
+
+    async def fetch(self):
+        try:
+            self.breaker.before_call()
+        except CircuitOpen:
+            self.stats['rejected'] += 1
+            raise
+
+        self.stats['refreshes'] += 1
+        try:
+            # _limit розуміє JSONPlaceholder; інші джерела обрізаємо самі
+            async with self.session.get(self.url, params={'_limit': self.limit}) as response:
+                if response.status != 200:
+                    raise UpstreamError(f'Джерело відповіло {response.status}')
+                data = await response.json(content_type=None)
+            if not isinstance(data, list):
+                raise UpstreamError('Джерело повернуло не список')
+        except (UpstreamError, aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.stats['failures'] += 1
+            self.breaker.record_failure()
+            if isinstance(e, UpstreamError):
+                raise
+            raise UpstreamError(str(e) or type(e).__name__) from e
+
+        self.breaker.record_success()
+        self.cached = data[:self.limit]
+        self.fetched_at = time.monotonic()
+        return self.cached
+
+    def snapshot(self):
+        return {
+            'breaker': self.breaker.state,
+            'cache_age': round(time.monotonic() - self.fetched_at, 1) if self.fetched_at is not None else None,
+            **self.stats
+        }
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Некоректний курсор пагінації"""
+
+
+def encode_cursor(created_at, item_id):
+    """Закодувати позицію (created_at, id) у непрозорий токен"""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Розкодувати токен курсора у (created_at, id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Некоректний курсор')
+
+
+def parse_limit(value, default, maximum):
+    """Розібрати розмір сторінки з обмеженням зверху"""
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def keyset_query(query, model, cursor=None, limit=20):
+    """Запит сторінки: умова на позицію курсора, сортування та limit + 1 рядок"""
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < item_id)
+        ))
+
+    # Беремо на один рядок більше, щоб знати чи є наступна сторінка
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def paginate_keyset(query, model, cursor=None, limit=20):
+    """Keyset-пагінація по (created_at DESC, id DESC)
+
+    Повертає (items, next_cursor). Вартість будь-якої сторінки однакова,
+    бо замість OFFSET використовується умова на останню позицію.
+    """
+    items = keyset_query(query, model, cursor, limit).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return items, next_cursor
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app
+from sqlalchemy import event
+from models import db
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Обробник виконав більше SQL-запитів, ніж задекларовано"""
+
+
+class QueryCounter:
+    """Лічильник SQL-запитів на рушіях SQLAlchemy (primary та репліки)"""
+
+    def __init__(self, *engines):
+        self.engines = engines
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Службові запити (напр. перевірка відставання реплік) не належать обробнику
+        if not conn.get_execution_options().get('query_budget_exempt'):
+            self.statements.append(statement)
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(limit, engine=None):
+    """Впасти, якщо всередині блоку виконано більше ніж limit запитів"""
+    engines = [engine] if engine is not None else db.engines.values()
+    with QueryCounter(*engines) as counter:
+        yield counter
+
+    if counter.count > limit:
+        raise QueryBudgetExceeded(
+            f'Виконано {counter.count} запитів при бюджеті {limit}:\n' + '\n'.join(counter.statements)
+        )
+
+
+def query_budget(limit):
+    """Задекларувати бюджет запитів для обробника
+
+    Перевірка вмикається лише в тестовому режимі (app.testing) або через
+    QUERY_BUDGET_ENFORCE, тож у продакшені декоратор нічого не коштує.
+    Лічильник глобальний для рушія, тому тести мають виконувати запити послідовно.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (current_app.testing or current_app.config['QUERY_BUDGET_ENFORCE']):
+                return func(*args, **kwargs)
+
+            with assert_max_queries(limit):
+                return func(*args, **kwargs)
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorator
@@ -0,0 +1,182 @@
+import re
+from datetime import datetime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from models import db, User, Post, Comment, ListVersion
+from pagination import keyset_query, encode_cursor
+
+# Назва -> функція, що будує запит (виконується в контексті додатку)
+HOT_QUERIES = {}
+
+_PYFORMAT = re.compile(r'%s')
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)(?: AS \S+)?$')
+_SQLITE_INDEX_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)(?: AS \S+)? USING (?:COVERING )?INDEX (\S+)')
+_SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR .*(?:ORDER|GROUP) BY')
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN для будь-якого SELECT зі збереженням параметрів"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = 'EXPLAIN QUERY PLAN ' if compiler.dialect.name == 'sqlite' else 'EXPLAIN '
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def hot_query(name, ordered=False):
+    """Зареєструвати гарячий запит для flask explain-check
+
+    ordered=True — прохід індексом у порядку ORDER BY очікуваний: сторінка з
+    LIMIT або ендпоінт, що навмисно віддає весь список. Для решти запитів
+    повний прохід індексом (напр. COUNT(*)) коштує O(N), як і скан таблиці.
+    """
+    def decorator(build):
+        build.ordered = ordered
+        HOT_QUERIES[name] = build
+        return build
+    return decorator
+
+
+def raw_sql(query, *args):
+    """Сирий SQL aiohttp-сервера (%s-плейсхолдери aiomysql) як text() з параметрами"""
+    names = iter(range(len(args)))
+    statement = db.text(_PYFORMAT.sub(lambda match: f':p{next(names)}', query))
+    return statement.bindparams(**{f'p{index}': value for index, value in enumerate(args)})
+
+
+def statement_of(query):
+    return query.statement if hasattr(query, 'statement') else query
+
+
+@hot_query('posts.page', ordered=True)
+def _posts_page():
+    return keyset_query(Post.listing_query(), Post, limit=20)
+
+
+@hot_query('posts.page_after_cursor', ordered=True)
+def _posts_page_after_cursor():
+    return keyset_query(Post.listing_query(), Post, encode_cursor(datetime(2024, 6, 1), 1000), 20)
+
+
+@hot_query('posts.validators')
+def _posts_validators():
+    return db.select(
+        ListVersion.current('posts', ListVersion.version),
+        ListVersion.current('posts', ListVersion.updated_at),
+        db.select(db.func.max(Post.updated_at)).scalar_subquery()
+    )
+
+
+@hot_query('post.comments')
+def _post_comments():
+    return Comment.query.options(db.joinedload(Comment.author)) \
+        .filter_by(post_id=1).order_by(Comment.created_at.desc())
+
+
+@hot_query('post.comments_in')
+def _post_comments_in():
+    # Так selectinload(Post.comments) добирає коментарі для detail_query
+    return Comment.query.filter(Comment.post_id.in_([1, 2, 3]))
+
+
+@hot_query('user.posts')
+def _user_posts():
+    return Post.query.filter_by(user_id=1).order_by(Post.created_at.desc())
+
+
+@hot_query('user.comments')
+def _user_comments():
+    return Comment.query.filter_by(user_id=1)
+
+
+@hot_query('users.page', ordered=True)
+def _users_page():
+    # Довідник користувачів та блок «Останні користувачі» на головній
+    return keyset_query(User.query, User, limit=20)
+
+
+@hot_query('async.posts', ordered=True)
+def _async_posts():
+    from aiohttp_server import POSTS_QUERY
+    return raw_sql(POSTS_QUERY)
+
+
+@hot_query('async.posts_validators')
+def _async_posts_validators():
+    from aiohttp_server import POSTS_VALIDATORS_QUERY
+    return raw_sql(POSTS_VALIDATORS_QUERY)
+
+
+@hot_query('async.post')
+def _async_post():
+    from aiohttp_server import POST_QUERY
+    return raw_sql(POST_QUERY, 1)
+
+
+@hot_query('async.post_comments')
+def _async_post_comments():
+    from aiohttp_server import POST_COMMENTS_QUERY
+    return raw_sql(POST_COMMENTS_QUERY, 1)
+
+
+@hot_query('async.comment_feed', ordered=True)
+def _async_comment_feed():
+    from comment_feed import FEED_COMMENTS_QUERY
+    return raw_sql(FEED_COMMENTS_QUERY, 1, 1000, 500)
+
+
+@hot_query('async.users', ordered=True)
+def _async_users():
+    from aiohttp_server import USERS_QUERY
+    return raw_sql(USERS_QUERY)
+
+
+def plan_problems(dialect, plan, ordered=False):
+    """Повні скани таблиць та індексів (крім ordered-запитів) і filesort у плані (MySQL або SQLite)"""
+    problems = []
+    for row in plan:
+        if dialect == 'sqlite':
+            detail = row['detail']
+            match = _SQLITE_FULL_SCAN.match(detail)
+            if match and match.group(1) != 'CONSTANT':
+                problems.append(f'повний скан {match.group(1)}')
+            match = _SQLITE_INDEX_SCAN.match(detail)
+            if match and not ordered:
+                problems.append(f'повний прохід індексу {match.group(2)} ({match.group(1)})')
+            if _SQLITE_SORT.search(detail):
+                problems.append('сортування в тимчасовому B-дереві (filesort)')
+        else:
+            table = row.get('table') or ''
+            if row.get('type') == 'ALL' and not table.startswith('<'):
+                problems.append(f'повний скан {table}')
+            if row.get('type') == 'index' and not ordered and not table.startswith('<'):
+                problems.append(f'повний прохід індексу {row.get("key")} ({table})')
+            if 'Using filesort' in (row.get('Extra') or ''):
+                problems.append(f'filesort ({table})')
+    return problems
+
+
+def explain(statement):
+    """План запиту як список словників"""
+    return [dict(row) for row in db.session.execute(Explain(statement_of(statement))).mappings()]
+
+
+def check_query_plans(names=None):
+    """Прогнати EXPLAIN для зареєстрованих запитів: [(назва, план, проблеми)]"""
+    dialect = db.engine.dialect.name
+    if dialect not in ('mysql', 'mariadb', 'sqlite'):
+        raise ValueError(f'EXPLAIN-перевірка не підтримує діалект {dialect}')
+
+    results = []
+    for name, build in HOT_QUERIES.items():
+        if names and name not in names:
+            continue
+        plan = explain(build())
+        results.append((name, plan, plan_problems(dialect, plan, build.ordered)))
+    return results
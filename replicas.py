@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from flask import g, request, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select, CompoundSelect
+
+# Кука «читати з primary до»: клієнт бачить власні записи, поки репліки наздоганяють
+STICKY_COOKIE = 'db_primary_until'
+
+
+class ReplicaRouter:
+    """Маршрутизація читань Flask-SQLAlchemy на репліки
+
+    Репліки задаються DATABASE_REPLICA_URLS і реєструються як бінди
+    replica1, replica2, ... На репліку йдуть лише SELECT в обробниках,
+    позначених @replica_reads, і лише поки запит нічого не записав та не
+    має куки STICKY_COOKIE (її ставить будь-який запит із записом). З
+    кількох реплік обирається найменш завантажена (найменше з'єднань
+    видано з пулу) серед здорових.
+
+    Здоров'я перевіряється не частіше ніж раз на REPLICA_CHECK_INTERVAL
+    секунд: відставання — вік найстаршого оновлення post, якого репліка
+    ще не бачить. Репліка з відставанням понад REPLICA_MAX_LAG або з
+    помилкою з'єднання виводиться з ротації до наступної перевірки.
+    Видалення рядків ця оцінка не помічає.
+    """
+
+    def __init__(self, app=None):
+        self.keys = []
+        self.max_lag = 5
+        self.check_interval = 5
+        self.sticky_seconds = 10
+        self.health = {}
+        self.checked_at = None
+        self.check_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.reads = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Викликати до db.init_app: бінди реплік мають бути в конфігурації до створення рушіїв"""
+        urls = [url.strip() for url in (app.config['DATABASE_REPLICA_URLS'] or '').split(',') if url.strip()]
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        self.keys = []
+        for number, url in enumerate(urls, 1):
+            key = f'replica{number}'
+            binds[key] = url
+            self.keys.append(key)
+
+        self.max_lag = app.config['REPLICA_MAX_LAG']
+        self.check_interval = app.config['REPLICA_CHECK_INTERVAL']
+        self.sticky_seconds = app.config['REPLICA_STICKY_SECONDS']
+        self.health = {key: {'healthy': True, 'lag': None, 'error': None} for key in self.keys}
+        self.reads = {key: 0 for key in self.keys}
+        self.reads['primary'] = 0
+        self.checked_at = None
+
+        app.after_request(self.remember_writes)
+
+    def bind_for(self, session, clause):
+        """Рушій репліки для цього виконання або None (primary)"""
+        if not self.keys or not has_request_context():
+            return None
+
+        if session._flushing or not isinstance(clause, (Select, CompoundSelect)):
+            # Запис (або невідомо що) — решта запиту читає з primary
+            g.db_wrote = True
+            return None
+
+        if not g.get('replica_reads') or g.get('db_wrote') or self.sticky():
+            return None
+
+        key = g.get('replica_key')
+        if key is None:
+            # Одна репліка на весь запит — без «стрибків» між різними знімками
+            key = g.replica_key = self.choose(session._db) or 'primary'
+            with self.lock:
+                self.reads[key] += 1
+        return session._db.engines[key] if key != 'primary' else None
+
+    def sticky(self):
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def choose(self, db):
+        self.check(db)
+        healthy = [key for key in self.keys if self.health[key]['healthy']]
+        if not healthy:
+            return None
+
+        def load(key):
+            pool = db.engines[key].pool
+            return pool.checkedout() if hasattr(pool, 'checkedout') else 0
+
+        return min(healthy, key=lambda key: (load(key), random.random()))
+
+    def check(self, db, force=False):
+        """Оновити стан реплік, якщо минув REPLICA_CHECK_INTERVAL (один потік за раз)"""
+        if not force and self.checked_at is not None and time.monotonic() - self.checked_at < self.check_interval:
+            return
+        if not self.check_lock.acquire(blocking=force):
+            return
+
+        try:
+            from models import Post
+
+            latest = db.select(db.func.max(Post.updated_at))
+            with db.engines[None].connect() as primary:
+                primary.execution_options(query_budget_exempt=True)
+                primary_latest = primary.execute(latest).scalar()
+
+                for key in self.keys:
+                    try:
+                        with db.engines[key].connect() as replica:
+                            replica.execution_options(query_budget_exempt=True)
+                            replica_latest = replica.execute(latest).scalar()
+                    except Exception as e:
+                        self.health[key] = {'healthy': False, 'lag': None, 'error': str(e)}
+                        continue
+
+                    lag = 0.0
+                    if primary_latest is not None and (replica_latest is None or replica_latest < primary_latest):
+                        missing = db.select(db.func.min(Post.updated_at))
+                        if replica_latest is not None:
+                            missing = missing.where(Post.updated_at > replica_latest)
+                        oldest_missing = primary.execute(missing).scalar()
+                        lag = max(0.0, (datetime.utcnow() - oldest_missing).total_seconds())
+
+                    self.health[key] = {'healthy': lag <= self.max_lag, 'lag': round(lag, 3), 'error': None}
+        finally:
+            self.checked_at = time.monotonic()
+            self.check_lock.release()
+
+    def remember_writes(self, response):
+        if g.get('db_wrote') and self.keys:
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time() + self.sticky_seconds)),
+                max_age=self.sticky_seconds, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def stats(self):
+        with self.lock:
+            reads = dict(self.reads)
+        return {
+            'replicas': {key: {**self.health[key], 'reads': reads[key]} for key in self.keys},
+            'primary_reads': reads.get('primary', 0)
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Сесія Flask-SQLAlchemy, що віддає читання replica_router"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            engine = replica_router.bind_for(self, clause)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_reads(func):
+    """Дозволити обробнику читати з реплік (лише SELECT, до першого запису)"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = g.get('replica_reads', False)
+        g.replica_reads = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g.replica_reads = previous
+
+    return wrapper
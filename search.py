@@ -0,0 +1,601 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+import heapq
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+from collections import Counter
+from array import array
+from operator import add, itemgetter
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Post
+
+logger = logging.getLogger('search')
+
+# Апострофи в українських словах (пам'ять, об’єкт) прибираємо, щоб слово не розривалось
+APOSTROPHES = re.compile(r"['’ʼ`]")
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from if in into is it of on or that the this to was were will with
+    і й та але або а в у на з із зі до за що це як не ні по про від для ти ви ми він вона воно вони
+    його її їх то так же чи бо коли де там тут
+""".split())
+
+# Заголовок важить більше за зміст
+TITLE_WEIGHT = 2
+# Префікс розгортається в кілька найчастіших слів з обмеженого відрізка словника
+MAX_PREFIX_SCAN = 200
+PREFIX_TERMS = 8
+# Найчастіші терміни перевіряються як доповнення префікса завжди, навіть поза відрізком
+POPULAR_TERMS = 2000
+# Скільки змін терміна накопичувати до злиття з його впорядкованим списком
+MERGE_THRESHOLD = 256
+# Найбільший блок, який пошук top-k читає з одного списку за крок
+MAX_BLOCK_SIZE = 1024
+# Синхронізація з БД перечитує і пости, змінені трохи раніше за попередню:
+# updated_at ставить процес, що пише, ще до commit
+SYNC_OVERLAP = timedelta(seconds=30)
+SNAPSHOT_FORMAT = 'search-index'
+SNAPSHOT_VERSION = 1
+
+
+def _is_indexable(token):
+    if token.isdigit():
+        return len(token) > 2
+    return len(token) > 1 and token not in STOP_WORDS
+
+
+def tokenize(text):
+    """Розбити текст на нормалізовані токени (українська та англійська)"""
+    text = APOSTROPHES.sub('', (text or '').lower())
+    return [token for token in TOKEN_RE.findall(text) if _is_indexable(token)]
+
+
+def _prefix_above(values, start, end, cutoff):
+    """Кінець відрізка values[start:end] (за спаданням) зі значеннями > cutoff"""
+    while start < end:
+        middle = (start + end) // 2
+        if values[middle] > cutoff:
+            start = middle + 1
+        else:
+            end = middle
+    return start
+
+
+class ReadWriteLock:
+    """Багато одночасних читачів (пошук) або один письменник (зміна індексу)
+
+    Письменник, що чекає, не пропускає нових читачів — інакше потік пошуків
+    відкладав би запис без кінця.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self.condition:
+            while self.writing or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writing or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+class SearchIndex:
+    """Інвертований індекс постів з BM25-ранжуванням та пошуком за префіксом
+
+    Індекс живе в пам'яті процесу. Воркер будує його (або читає знімок) у
+    фоновому потоці після першого запиту; до готовності пошук відповідає 503.
+    Записи цього процесу оновлюють індекс одразу, а зміни інших воркерів та
+    серверів підтягує sync(): не частіше ніж раз на SEARCH_SYNC_INTERVAL він
+    порівнює валідатори списку постів і переіндексовує пости з новішим
+    updated_at. Видалені іншими процесами пости лишаються в індексі до
+    перебудови, але відсіюються, коли результати дочитуються з БД.
+
+    Розрахований на сотні тисяч постів: на 100k одне слово чи префікс
+    шукаються за десяті частки мілісекунди, пара дуже частих слів — 1-2 мс
+    (див. benchmarks/search.py). Для мільйонів постів потрібен окремий
+    пошуковий рушій: індекс цього процесу вже не вміщується в пам'ять воркера.
+
+    Для кожного терміна зберігається внесок BM25 без idf (impact) двічі:
+    словником post_id -> impact для довільного доступу та списком за спаданням
+    impact. Пошук top-k — алгоритм порогу (Fagin's TA): списки термінів
+    читаються з голови, кожен новий пост оцінюється повністю, і читання
+    зупиняється, щойно k-й результат не гірший за суму поточних impact —
+    решта постів уже не може його обігнати. Для одного терміна це k кроків
+    незалежно від розміру колекції.
+
+    Середня довжина документа фіксується при побудові (як у Lucene, impact не
+    перераховуються при кожному записі). Нові та змінені пости потрапляють у
+    невеликий хвіст pending, який пошук оцінює повністю; хвіст і видалені
+    записи зливаються зі списком, коли їх накопичиться MERGE_THRESHOLD.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = ReadWriteLock()
+        self.build_lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.built = False
+        self.builder_pid = None
+        self.snapshot_path = None
+        self.sync_interval = 5.0
+        self.next_sync = 0.0
+        self.reset()
+
+    def reset(self):
+        self.impacts = {}        # термін -> {post_id: impact}
+        self.ordered = {}        # термін -> ([post_id], array impact) за спаданням impact
+        self.pending = {}        # термін -> {post_id} ще не влиті в ordered
+        self.garbage = Counter() # термін -> кількість застарілих записів в ordered
+        self.doc_terms = {}      # post_id -> Counter термінів (для видалення)
+        self.doc_len = {}
+        self.total_len = 0
+        self.avg_len = None
+        self.vocabulary = []     # відсортовані терміни для префіксного пошуку
+        self.popular = []        # відсортовані найчастіші терміни (станом на побудову)
+        self.validators = None   # Post.list_validators() на момент останньої синхронізації
+        self.synced_at = None    # з якого updated_at перечитувати пости при синхронізації
+
+    def _impact(self, freq, length):
+        norm = self.k1 * (1 - self.b + self.b * length / self.avg_len)
+        return freq * (self.k1 + 1) / (freq + norm)
+
+    def _store(self, post_id, terms):
+        self.doc_terms[post_id] = terms
+        length = sum(terms.values())
+        self.doc_len[post_id] = length
+        self.total_len += length
+        return length
+
+    def _add(self, post_id, title, content):
+        terms = Counter(tokenize(content))
+        for token in tokenize(title):
+            terms[token] += TITLE_WEIGHT
+
+        length = self._store(post_id, terms)
+        if self.avg_len is None:
+            self.avg_len = max(length, 1)
+
+        for term, freq in terms.items():
+            impacts = self.impacts.get(term)
+            if impacts is None:
+                impacts = self.impacts[term] = {}
+                self.ordered[term] = ([], array('d'))
+                self.pending[term] = set()
+                insort(self.vocabulary, term)
+            impacts[post_id] = self._impact(freq, length)
+            self.pending[term].add(post_id)
+            self._maybe_merge(term)
+
+    def _remove(self, post_id):
+        terms = self.doc_terms.pop(post_id, None)
+        if terms is None:
+            return
+
+        self.total_len -= self.doc_len.pop(post_id)
+        for term in terms:
+            impacts = self.impacts[term]
+            del impacts[post_id]
+            if not impacts:
+                del self.impacts[term], self.ordered[term], self.pending[term]
+                self.garbage.pop(term, None)
+                del self.vocabulary[bisect_left(self.vocabulary, term)]
+                continue
+
+            pending = self.pending[term]
+            if post_id in pending:
+                pending.discard(post_id)
+            else:
+                self.garbage[term] += 1
+            self._maybe_merge(term)
+
+    def _maybe_merge(self, term):
+        if len(self.pending[term]) + self.garbage[term] >= MERGE_THRESHOLD:
+            self._merge(term)
+
+    def _merge(self, term):
+        """Влити хвіст pending у впорядкований список і прибрати застарілі записи"""
+        impacts = self.impacts[term]
+        pending = self.pending[term]
+        entries = [
+            (post_id, impact) for post_id, impact in zip(*self.ordered[term])
+            if post_id not in pending and impacts.get(post_id) == impact
+        ]
+        # Timsort зливає дві відсортовані послідовності за лінійний час
+        entries.extend(sorted(((post_id, impacts[post_id]) for post_id in pending), key=itemgetter(1), reverse=True))
+        self.ordered[term] = self._ranked(entries)
+        pending.clear()
+        self.garbage.pop(term, None)
+
+    @staticmethod
+    def _ranked(entries):
+        """[(post_id, impact)] -> паралельні post_id та array impact за спаданням impact"""
+        entries.sort(key=itemgetter(1), reverse=True)
+        return [post_id for post_id, _ in entries], array('d', [impact for _, impact in entries])
+
+    def _index_all(self):
+        """Порахувати impact і впорядковані списки для всіх doc_terms разом"""
+        self.avg_len = self.total_len / len(self.doc_len) if self.doc_len else None
+        impacts = self.impacts
+        for post_id, terms in self.doc_terms.items():
+            length = self.doc_len[post_id]
+            for term, freq in terms.items():
+                posting = impacts.get(term)
+                if posting is None:
+                    posting = impacts[term] = {}
+                posting[post_id] = self._impact(freq, length)
+
+        for term, posting in impacts.items():
+            self.ordered[term] = self._ranked(list(posting.items()))
+            self.pending[term] = set()
+        self.vocabulary = sorted(impacts)
+        self.popular = sorted(heapq.nlargest(POPULAR_TERMS, impacts, key=lambda term: len(impacts[term])))
+
+    def _adopt(self, other):
+        """Перейняти стан іншого індексу (побудованого без блокування пошуку)"""
+        for name in ('impacts', 'ordered', 'pending', 'garbage', 'doc_terms', 'doc_len',
+                     'total_len', 'avg_len', 'vocabulary', 'popular', 'validators', 'synced_at'):
+            setattr(self, name, getattr(other, name))
+        self.built = True
+
+    def build(self, chunk_size=1000):
+        """Побудувати індекс з БД (потребує контексту додатку)
+
+        Новий індекс збирається окремо і підміняє поточний одним кроком, тож
+        пошук не чекає на побудову. Зміни, зроблені під час неї, підтягне sync().
+        """
+        fresh = SearchIndex(self.k1, self.b)
+        fresh.synced_at = datetime.utcnow()
+        fresh.validators = tuple(Post.list_validators())
+        query = db.select(Post.id, Post.title, Post.content) \
+            .execution_options(yield_per=chunk_size)
+        for post_id, title, content in db.session.execute(query):
+            terms = Counter(tokenize(content))
+            for token in tokenize(title):
+                terms[token] += TITLE_WEIGHT
+            fresh._store(post_id, terms)
+        fresh._index_all()
+
+        with self.lock.write():
+            self._adopt(fresh)
+
+    def sync(self):
+        """Підтягнути зміни інших процесів; повертає кількість переіндексованих постів"""
+        validators = tuple(Post.list_validators())
+        if validators == self.validators:
+            return 0
+
+        started = datetime.utcnow()
+        query = db.select(Post.id, Post.title, Post.content) \
+            .where(Post.updated_at >= self.synced_at - SYNC_OVERLAP)
+        rows = db.session.execute(query).all()
+        with self.lock.write():
+            for post_id, title, content in rows:
+                self._remove(post_id)
+                self._add(post_id, title, content)
+            self.validators = validators
+            self.synced_at = started
+        return len(rows)
+
+    def maybe_sync(self):
+        """sync() не частіше ніж раз на sync_interval (одночасні виклики не чекають один одного)"""
+        if time.monotonic() < self.next_sync or not self.sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.next_sync = time.monotonic() + self.sync_interval
+            self.sync()
+        finally:
+            self.sync_lock.release()
+
+    def init_app(self, app):
+        """Налаштувати індекс; сама побудова — у фоні після першого запиту воркера
+
+        Не при імпорті: з gunicorn --preload потік, запущений у master, не
+        переживе fork, а кожен воркер однаково тримає власну копію індексу.
+        """
+        self.snapshot_path = snapshot_path(app)
+        self.sync_interval = app.config['SEARCH_SYNC_INTERVAL']
+        if app.config['SEARCH_BUILD_ON_STARTUP']:
+            app.before_request(lambda: self.start(app))
+
+    def start(self, app):
+        """Запустити побудову у фоновому потоці (раз на процес)"""
+        if self.built or self.builder_pid == os.getpid():
+            return
+        with self.build_lock:
+            if self.built or self.builder_pid == os.getpid():
+                return
+            self.builder_pid = os.getpid()
+            threading.Thread(target=self._build_in_background, args=(app,), name='search-index', daemon=True).start()
+
+    def _build_in_background(self, app):
+        started = time.perf_counter()
+        with app.app_context():
+            try:
+                loaded = self.snapshot_path is not None and self.load(self.snapshot_path)
+                if loaded:
+                    self.sync()
+                else:
+                    self.build()
+                    if self.snapshot_path is not None:
+                        self.save(self.snapshot_path)
+                logger.info(
+                    'Пошуковий індекс готовий: %d постів за %.1f с (%s)',
+                    len(self.doc_len), time.perf_counter() - started, 'знімок' if loaded else 'побудова'
+                )
+            except Exception:
+                # Напр. схема ще не створена — наступний запит спробує знову
+                logger.exception('Пошуковий індекс не побудовано')
+                self.builder_pid = None
+            finally:
+                db.session.remove()
+
+    def ready(self, app):
+        """Чи можна шукати; якщо індексу ще немає — запускає його побудову"""
+        if not self.built:
+            self.start(app)
+        return self.built
+
+    def index_post(self, post):
+        """Додати або переіндексувати пост після запису"""
+        self.index_document(post.id, post.title, post.content)
+
+    def index_document(self, post_id, title, content):
+        """Додати або переіндексувати пост за окремими полями"""
+        if not self.built:
+            return
+        with self.lock.write():
+            self._remove(post_id)
+            self._add(post_id, title, content)
+
+    def remove_post(self, post_id):
+        """Прибрати пост з індексу після видалення"""
+        if not self.built:
+            return
+        with self.lock.write():
+            self._remove(post_id)
+
+    def invalidate(self):
+        """Індекс пропустив зміни цього процесу — синхронізувати з БД при наступному пошуку"""
+        self.validators = None
+        self.next_sync = 0.0
+
+    def save(self, path):
+        """Зберегти знімок індексу (JSON, доступний лише власнику процесу)"""
+        with self.lock.read():
+            state = {
+                'format': SNAPSHOT_FORMAT,
+                'version': SNAPSHOT_VERSION,
+                'validators': [encode_validator(value) for value in self.validators],
+                'synced_at': self.synced_at.isoformat(),
+                'doc_terms': self.doc_terms
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as snapshot:
+                json.dump(state, snapshot, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+
+    def load(self, path):
+        """Завантажити знімок; зміни після нього підтягне sync()
+
+        Знімок, який може переписати хтось інший (чужий власник або права
+        запису для групи/всіх), ігнорується.
+        """
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if info.st_uid != os.getuid() or info.st_mode & 0o022:
+            logger.warning('Знімок індексу %s ігнорується: його можуть змінювати інші користувачі', path)
+            return False
+
+        with open(path, encoding='utf-8') as snapshot:
+            state = json.load(snapshot)
+        if state.get('format') != SNAPSHOT_FORMAT or state.get('version') != SNAPSHOT_VERSION:
+            return False
+
+        fresh = SearchIndex(self.k1, self.b)
+        for post_id, terms in state['doc_terms'].items():
+            fresh._store(int(post_id), Counter(terms))
+        fresh._index_all()
+        fresh.validators = tuple(decode_validator(value) for value in state['validators'])
+        fresh.synced_at = datetime.fromisoformat(state['synced_at'])
+
+        with self.lock.write():
+            self._adopt(fresh)
+        return True
+
+    def _completions(self, words, term, limit):
+        start = bisect_left(words, term)
+        for candidate in words[start:start + limit]:
+            if not candidate.startswith(term):
+                break
+            yield candidate
+
+    def _expand(self, term):
+        """Доповнення префікса: PREFIX_TERMS найчастіших серед перших MAX_PREFIX_SCAN та популярних"""
+        candidates = set(self._completions(self.vocabulary, term, MAX_PREFIX_SCAN))
+        candidates.update(
+            candidate for candidate in self._completions(self.popular, term, MAX_PREFIX_SCAN)
+            if candidate in self.impacts
+        )
+        if len(candidates) <= PREFIX_TERMS:
+            return list(candidates)
+
+        expanded = heapq.nlargest(PREFIX_TERMS, candidates, key=lambda candidate: len(self.impacts[candidate]))
+        # Саме слово, якщо воно є в словнику, завжди серед доповнень
+        if term in candidates and term not in expanded:
+            expanded[-1] = term
+        return expanded
+
+    def _top_k(self, sources, limit):
+        """Top-k за сумою оцінок джерел (алгоритм порогу по блоках)
+
+        Джерело — список (weight, термін); його оцінка для поста — максимум
+        weight * impact серед термінів (для звичайного слова термін один,
+        префікс — це кілька доповнень, і пост оцінюється найкращим з них).
+        Списки читаються блоками, що зростають у 1.5 раза від limit. Коли
+        top уже повний, з блоку слова беруться лише записи, з якими пост ще
+        може обігнати k-й результат (бінарним пошуком по спадних impact);
+        решта записів блоку не оцінюється. Для одного слова вистачає першого
+        блоку.
+        """
+        scorers = [[(weight, self.impacts[term].get) for weight, term in source] for source in sources]
+
+        def score(post_ids, floor):
+            """(оцінка, post_id) лише для постів, що перевищують floor"""
+            totals = [0.0] * len(post_ids)
+            for members in scorers:
+                parts = [[weight * get(post_id, 0.0) for post_id in post_ids] for weight, get in members]
+                totals = list(map(add, totals, parts[0] if len(parts) == 1 else map(max, *parts)))
+            return [(total, post_id) for total, post_id in zip(totals, post_ids) if total > floor]
+
+        # Хвости pending оцінюємо повністю: їх немає у впорядкованих списках
+        seen = {post_id for source in sources for _, term in source for post_id in self.pending[term]}
+        top = sorted(score(list(seen), -math.inf), reverse=True)[:limit]
+
+        # Курсори [джерело, weight, impacts, post_id, impact, позиція, чи є застарілі записи]
+        cursors = [
+            [index, weight, self.impacts[term], *self.ordered[term], 0, self.garbage[term] > 0]
+            for index, source in enumerate(sources) for weight, term in source
+        ]
+        single = [len(source) == 1 for source in sources]
+        # Межа джерела — найбільша оцінка, яку ще може дати непрочитаний запис
+        bounds = [0.0] * len(sources)
+        for index, weight, _, _, ranked, _, _ in cursors:
+            if ranked:
+                bounds[index] = max(bounds[index], weight * ranked[0])
+
+        size = max(limit, 16)
+        while cursors:
+            floor = top[-1][0] if len(top) >= limit else -math.inf
+            previous, bounds = bounds, [0.0] * len(sources)
+            fresh = set()
+            for cursor in cursors:
+                index, weight, impacts, post_ids, ranked, position, stale = cursor
+                end = min(position + size, len(post_ids))
+                useful = end
+                if single[index] and floor > -math.inf:
+                    # Непрочитаний пост з impact <= cutoff не обжене k-й результат навіть з
+                    # максимумом решти джерел — далі в блоці оцінювати нічого
+                    cutoff = (floor - (sum(previous) - previous[index])) / weight
+                    useful = _prefix_above(ranked, position, end, cutoff)
+                block = post_ids[position:useful]
+                if stale:
+                    # Видалені та переіндексовані пропускаємо (актуальна версія — в pending)
+                    fresh.update(
+                        post_id for post_id, impact in zip(block, ranked[position:useful])
+                        if impacts.get(post_id) == impact
+                    )
+                else:
+                    fresh.update(block)
+                cursor[5] = end
+                if end < len(post_ids):
+                    # Непрочитані записи не більші за останній прочитаний
+                    bounds[index] = max(bounds[index], weight * ranked[end - 1])
+
+            cursors = [cursor for cursor in cursors if cursor[5] < len(cursor[3])]
+            fresh -= seen
+            seen |= fresh
+            top.extend(score(list(fresh), floor))
+            top.sort(reverse=True)
+            del top[limit:]
+            # Непрочитаний пост набирає не більше суми меж — k-й результат уже не обігнати
+            if len(top) >= limit and top[-1][0] >= sum(bounds):
+                break
+            size = min(size + size // 2, MAX_BLOCK_SIZE)
+
+        return [(post_id, score) for score, post_id in top]
+
+    def search(self, query, limit=20):
+        """Знайти пости: [(post_id, score)] за спаданням релевантності
+
+        Останнє слово запиту (або слово з * в кінці) шукається як префікс.
+        """
+        raw_terms = query.split()
+        prefix_last = bool(raw_terms) and not query.endswith(' ')
+        terms = []
+        for position, raw in enumerate(raw_terms):
+            tokens = tokenize(raw)
+            if not tokens:
+                continue
+            is_prefix = raw.endswith('*') or (prefix_last and position == len(raw_terms) - 1)
+            for index, token in enumerate(tokens):
+                terms.append((token, is_prefix and index == len(tokens) - 1))
+
+        with self.lock.read():
+            total_docs = len(self.doc_len)
+            if not terms or not total_docs:
+                return []
+
+            def idf(term):
+                df = len(self.impacts[term])
+                return math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+            # Повторене слово важить більше; кожен префікс — окреме джерело
+            weights, prefixes = {}, []
+            for token, is_prefix in terms:
+                if is_prefix:
+                    expanded = [(idf(term), term) for term in self._expand(token)]
+                    if expanded:
+                        prefixes.append(expanded)
+                elif token in self.impacts:
+                    weights[token] = weights.get(token, 0.0) + idf(token)
+
+            sources = [[(weight, term)] for term, weight in weights.items()] + prefixes
+            return self._top_k(sources, limit) if sources else []
+
+
+
+def snapshot_path(app):
+    """Шлях до знімка: SEARCH_INDEX_SNAPSHOT, за замовчуванням у теці instance додатку"""
+    path = app.config['SEARCH_INDEX_SNAPSHOT']
+    if path == 'off':
+        return None
+    return path or os.path.join(app.instance_path, 'search-index.json')
+
+
+def encode_validator(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def decode_validator(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+search_index = SearchIndex()
@@ -0,0 +1,148 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from models import db, User, Post, Comment, ListVersion, make_excerpt
+from hashing import password_hasher
+
+ADMIN_EMAIL = 'admin@example.com'
+ADMIN_PASSWORD = 'admin123'
+USER_PASSWORD = 'password123'
+
+# Словник для синтетичних текстів (з колишніх фікстур init_db_auth)
+WORDS = """
+    блог пост ідеї досвід технології програмування життя flask python фреймворк веб додаток
+    маршрутизація шаблони база даних навчання продуктивність інструменти код команда помилки
+    розвиток практика кібербезпека захист дані інтернет хакери інформація секрети поради
+    цікавий корисний важливий простий гнучкий сучасний цифровий новий чистий головний
+    пишемо читаємо вчимося працюємо створюємо розглянемо ділимося будемо плануємо шукаємо
+    the and of to in for with on api server database cache query latency request response
+""".split()
+
+
+def zipf_index(rng, n, s=1.0):
+    """Індекс 0..n-1 з приблизно зіпфівським розподілом (обернена CDF, O(1) пам'яті)"""
+    u = rng.random()
+    if abs(s - 1.0) < 1e-9:
+        rank = math.exp(u * math.log(n + 1)) - 1
+    else:
+        exponent = 1 - s
+        rank = ((u * ((n + 1) ** exponent - 1)) + 1) ** (1 / exponent) - 1
+    return min(n - 1, int(rank))
+
+
+def spread(n, multiplier=2654435761):
+    """Бієкція 0..n-1 -> 0..n-1, щоб «гарячі» id не були просто першими"""
+    while math.gcd(multiplier, n) != 1:
+        multiplier += 2
+    return lambda index: (index * multiplier) % n
+
+
+def sentence(rng, min_words, max_words):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+
+def paragraph(rng, sentences):
+    return ' '.join(sentence(rng, 6, 16) for _ in range(sentences))
+
+
+class SeedProgress:
+    """Прогрес та швидкість (рядків/с) по кожній таблиці"""
+
+    def __init__(self, report):
+        self.report = report
+        self.started = time.perf_counter()
+
+    def table(self, name, done, total, table_started):
+        elapsed = max(time.perf_counter() - table_started, 1e-9)
+        self.report(f'{name}: {done}/{total} ({done / elapsed:.0f} рядків/с)')
+
+    def finish(self, total_rows):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        self.report(f'Разом {total_rows} рядків за {elapsed:.1f} с ({total_rows / elapsed:.0f} рядків/с)')
+
+
+def seed_database(users=1000, posts=10000, comments=50000, seed=42, batch_size=5000,
+                  days=365, author_skew=1.0, post_skew=1.1, report=print):
+    """Детерміновано згенерувати користувачів, пости та коментарі
+
+    Автори постів і коментарів розподілені за Зіпфом (кілька дуже активних
+    авторів), коментарі концентруються на «гарячих» постах. Рядки вставляються
+    пакетним executemany в обхід ORM, а пароль хешується лише двічі на весь набір.
+    Потребує контексту додатку; таблиці мають бути порожні.
+    """
+    rng = random.Random(seed)
+    progress = SeedProgress(report)
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(days=days)
+    window = (end - start).total_seconds()
+
+    admin_hash = password_hasher.hash(ADMIN_PASSWORD)
+    user_hash = password_hasher.hash(USER_PASSWORD)
+
+    def insert_batches(model, total, make_row):
+        table_started = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            rows = [make_row(index) for index in range(offset, min(offset + batch_size, total))]
+            db.session.execute(db.insert(model.__table__), rows)
+            db.session.commit()
+            progress.table(model.__tablename__, offset + len(rows), total, table_started)
+
+    def user_row(index):
+        created_at = start + timedelta(seconds=window * index / users)
+        return {
+            'id': index + 1,
+            'username': 'admin' if index == 0 else f'user{index}',
+            'email': ADMIN_EMAIL if index == 0 else f'user{index}@example.com',
+            'password_hash': admin_hash if index == 0 else user_hash,
+            'is_admin': index == 0,
+            'created_at': created_at,
+            'updated_at': created_at
+        }
+
+    author_of = spread(users)
+
+    def post_time(post_id):
+        return start + timedelta(seconds=window * (post_id - 1) / posts)
+
+    def post_row(index):
+        created_at = post_time(index + 1)
+        # Довжина постів з «довгим хвостом»: більшість короткі, частина — дуже довгі
+        content = paragraph(rng, max(1, min(200, int(rng.lognormvariate(1.5, 0.9)))))
+        return {
+            'id': index + 1,
+            'title': sentence(rng, 3, 8)[:100],
+            'content': content,
+            'excerpt': make_excerpt(content),
+            'user_id': author_of(zipf_index(rng, users, author_skew)) + 1,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'version': 1
+        }
+
+    hot_post = spread(posts, multiplier=40503)
+
+    def comment_row(index):
+        post_id = hot_post(zipf_index(rng, posts, post_skew)) + 1
+        remaining = (end - post_time(post_id)).total_seconds()
+        created_at = post_time(post_id) + timedelta(seconds=min(remaining, rng.expovariate(1 / 86400)))
+        return {
+            'id': index + 1,
+            'content': sentence(rng, 3, 25),
+            'post_id': post_id,
+            'user_id': author_of(zipf_index(rng, users, author_skew)) + 1,
+            'created_at': created_at,
+            'updated_at': created_at
+        }
+
+    insert_batches(User, users, user_row)
+    if users and posts:
+        insert_batches(Post, posts, post_row)
+        insert_batches(Comment, comments, comment_row)
+    else:
+        posts = comments = 0
+    ListVersion.bump('posts')
+    db.session.commit()
+
+    progress.finish(users + posts + comments)
@@ -0,0 +1,71 @@
+import asyncio
+import contextvars
+import time
+
+
+class SingleFlight:
+    """Об'єднання однакових одночасних запитів в aiohttp
+
+    Перший запит з ключем (лідер) запускає produce() окремою задачею, решта
+    з тим самим ключем чекають на її результат — одна робота з БД та одна
+    серіалізація на всіх. Задача захищена від скасування: якщо клієнт-лідер
+    відключився, інші все одно отримають відповідь. Контекстні змінні лідера
+    задача не успадковує. cache_ms > 0 додатково
+    тримає готовий результат коротке вікно після завершення (помилки не
+    кешуються).
+    """
+
+    def __init__(self, cache_ms=0, cache_size=1000):
+        self.cache_ttl = cache_ms / 1000
+        self.cache_size = cache_size
+        self.in_flight = {}
+        self.cache = {}
+        self.stats = {'leaders': 0, 'collapsed': 0, 'cache_hits': 0}
+
+    async def run(self, key, produce):
+        if self.cache_ttl:
+            cached = self.cache.get(key)
+            if cached is not None:
+                expires, result = cached
+                if expires > time.monotonic():
+                    self.stats['cache_hits'] += 1
+                    return result
+                del self.cache[key]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.stats['leaders'] += 1
+            # Порожній контекст: SQL спільної задачі не записується в статистику (sql_timing) лідера
+            task = self.in_flight[key] = contextvars.Context().run(asyncio.ensure_future, produce())
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats['collapsed'] += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not self.cache_ttl or task.cancelled() or task.exception() is not None:
+            return
+
+        if len(self.cache) >= self.cache_size:
+            # Вікно коротке — простіше викинути все, ніж вести LRU
+            now = time.monotonic()
+            self.cache = {k: v for k, v in self.cache.items() if v[0] > now}
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+        self.cache[key] = (time.monotonic() + self.cache_ttl, task.result())
+
+    def snapshot(self):
+        return {'in_flight': len(self.in_flight), 'cached': len(self.cache), **self.stats}
+
+
+def request_key(request):
+    """Нормалізований ключ: маршрут, параметри шляху та відсортований query string"""
+    route = request.match_info.route.resource
+    return (
+        route.canonical if route is not None else request.path,
+        tuple(sorted(request.match_info.items())),
+        tuple(sorted(request.query.items()))
+    )
@@ -0,0 +1,169 @@
+import json
+import logging
+import re
+from contextvars import ContextVar
+from time import perf_counter
+
+slow_query_logger = logging.getLogger('sql.slow')
+
+# Статистика поточного запиту; ContextVar працює і для потоків Flask, і для задач asyncio
+current_timings = ContextVar('current_timings', default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'(?:%\(\w+\)s|%s|\?|:\w+)')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+# Лапки та зворотні слеші не можна лишати в desc="..." заголовка
+_HEADER_UNSAFE = re.compile(r'["\\]|[^\x20-\x7e]')
+# Довжина SQL найповільнішого запиту в Server-Timing
+SLOWEST_DESC_LENGTH = 80
+
+
+def normalize_sql(statement):
+    """Прибрати літерали та параметри, щоб однакові запити групувались в лозі"""
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _PLACEHOLDERS.sub('?', statement)
+    statement = _IN_LIST.sub('(?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class RequestTimings:
+    """SQL-статистика одного HTTP-запиту"""
+
+    __slots__ = ('started', 'slow_ms', 'path', 'query_count', 'db_time', 'slowest', 'slowest_time', 'template_time')
+
+    def __init__(self, slow_ms, path=None):
+        self.started = perf_counter()
+        self.slow_ms = slow_ms
+        self.path = path
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest = None
+        self.slowest_time = 0.0
+        self.template_time = 0.0
+
+    def record(self, statement, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest = statement
+
+        if duration * 1000 >= self.slow_ms:
+            slow_query_logger.warning(json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(duration * 1000, 3),
+                'path': self.path,
+                'sql': normalize_sql(statement)
+            }, ensure_ascii=False))
+
+    def slowest_desc(self):
+        """Нормалізований SQL найповільнішого запиту, обрізаний для заголовка"""
+        statement = _HEADER_UNSAFE.sub('', normalize_sql(self.slowest))
+        if len(statement) > SLOWEST_DESC_LENGTH:
+            statement = statement[:SLOWEST_DESC_LENGTH - 3] + '...'
+        return statement
+
+    def server_timing(self):
+        """Значення заголовка Server-Timing"""
+        total = (perf_counter() - self.started) * 1000
+        db_ms = self.db_time * 1000
+        parts = [f'db;dur={db_ms:.2f};desc="{self.query_count} queries"']
+        if self.slowest is not None:
+            parts.append(f'db-slowest;dur={self.slowest_time * 1000:.2f};desc="{self.slowest_desc()}"')
+        if self.template_time:
+            parts.append(f'tpl;dur={self.template_time * 1000:.2f}')
+        parts.append(f'app;dur={max(total - db_ms - self.template_time * 1000, 0):.2f}')
+        parts.append(f'total;dur={total:.2f}')
+        return ', '.join(parts)
+
+
+def start_request(slow_ms, path=None):
+    """Почати збір статистики для поточного контексту"""
+    timings = RequestTimings(slow_ms, path)
+    current_timings.set(timings)
+    return timings
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timings.get() is not None:
+        conn.info.setdefault('query_started', []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = current_timings.get()
+    if timings is not None and conn.info.get('query_started'):
+        timings.record(statement, perf_counter() - conn.info['query_started'].pop())
+
+
+def init_sql_timing(app):
+    """Увімкнути SQL-інструментацію для Flask (SQL_TIMING_ENABLED)
+
+    Вимкнена інструментація не додає жодних слухачів; увімкнена коштує
+    два виклики perf_counter на запит до БД.
+    """
+    if not app.config['SQL_TIMING_ENABLED']:
+        return
+
+    from flask import request, g, template_rendered, before_render_template
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # Слухачі на класі Engine покривають усі рушії процесу (в тому числі binds)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    slow_ms = app.config['SQL_SLOW_QUERY_MS']
+
+    @app.before_request
+    def start_sql_timing():
+        g.sql_timings = start_request(slow_ms, request.path)
+
+    @before_render_template.connect_via(app)
+    def start_template_timing(sender, template, context, **extra):
+        g.template_started = perf_counter()
+
+    @template_rendered.connect_via(app)
+    def stop_template_timing(sender, template, context, **extra):
+        timings = g.get('sql_timings')
+        if timings is not None and 'template_started' in g:
+            timings.template_time += perf_counter() - g.pop('template_started')
+
+    @app.after_request
+    def add_server_timing(response):
+        timings = g.get('sql_timings')
+        if timings is not None:
+            response.headers['Server-Timing'] = timings.server_timing()
+        return response
+
+    @app.teardown_request
+    def stop_sql_timing(exc):
+        current_timings.set(None)
+
+
+class TimedCursor:
+    """Обгортка курсора aiomysql, що записує час execute/executemany"""
+
+    def __init__(self, cursor, timings):
+        self._cursor = cursor
+        self._timings = timings
+
+    async def execute(self, query, *args):
+        started = perf_counter()
+        try:
+            return await self._cursor.execute(query, *args)
+        finally:
+            self._timings.record(query, perf_counter() - started)
+
+    async def executemany(self, query, args):
+        started = perf_counter()
+        try:
+            return await self._cursor.executemany(query, args)
+        finally:
+            self._timings.record(query, perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Config читає змінні середовища при імпорті: тимчасова SQLite замість MySQL,
+# хешування в поточному потоці та без фонової побудови пошукового індексу
+_tmpdir = tempfile.mkdtemp(prefix='flask-crud-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmpdir, 'app.sqlite')
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+os.environ['SEARCH_BUILD_ON_STARTUP'] = 'false'
+os.environ['SEARCH_INDEX_SNAPSHOT'] = 'off'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from main import create_app
+    from models import db
+
+    app = create_app()[0]
+    app.testing = True
+    with app.app_context():
+        db.create_all(bind_key=None)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
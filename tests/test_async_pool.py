@@ -0,0 +1,76 @@
+import asyncio
+
+import jwt
+import pytest
+from aiohttp.test_utils import TestServer, TestClient
+from sqlalchemy.engine import make_url
+
+from aiohttp_server import AsyncBlogAPI
+from benchmarks.sqlite_pool import create_sqlite_pool
+from config import Config
+from models import db, User, Post
+
+
+@pytest.fixture(scope='module')
+def database(app):
+    """Файл SQLite спільного тестового додатка з одним постом"""
+    with app.app_context():
+        user = User(username='pool', email='pool@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        post = Post(title='Пул', content='Зміст', user_id=user.id)
+        db.session.add(post)
+        db.session.commit()
+        return make_url(app.config['SQLALCHEMY_DATABASE_URI']).database, post.id
+
+
+def run(database, scenario):
+    """scenario(api, client) з пулом на одне з'єднання і коротким acquire_timeout"""
+    async def main():
+        api = AsyncBlogAPI(
+            db_config={'host': '', 'user': '', 'password': '', 'database': database},
+            pool_config={'minsize': 1, 'maxsize': 1, 'acquire_timeout': 0.1},
+            pool_factory=create_sqlite_pool
+        )
+        async with TestClient(TestServer(api.app)) as client:
+            await scenario(api, client)
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('path', ['/api/async/posts', '/api/async/posts/{post_id}'])
+def test_acquire_timeout_returns_503(database, path):
+    path = path.format(post_id=database[1])
+
+    async def scenario(api, client):
+        # Єдине з'єднання пулу зайняте довше за acquire_timeout
+        async with api.db_connection():
+            response = await client.get(path)
+            assert response.status == 503
+            assert (await response.json())['success'] is False
+        assert api.pool_stats['timeouts'] >= 1
+
+        # З'єднання повернуто — запит знову обслуговується
+        response = await client.get(path)
+        assert response.status == 200
+
+    run(database[0], scenario)
+
+
+
+def test_comment_acquire_timeout_returns_503(database):
+    database_path, post_id = database
+    token = jwt.encode({'sub': 1, 'type': 'access'}, Config.JWT_SECRET_KEY, algorithm='HS256')
+
+    async def scenario(api, client):
+        # Писач коментарів не дочекався з'єднання — обробник відповідає 503, а не 500
+        async with api.db_connection():
+            response = await client.post(
+                f'/api/async/posts/{post_id}/comments',
+                json={'content': 'Коментар'},
+                headers={'Authorization': f'Bearer {token}'}
+            )
+            assert response.status == 503
+        assert api.comment_writer.stats['failed'] == 1
+
+    run(database_path, scenario)
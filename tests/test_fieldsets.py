@@ -0,0 +1,26 @@
+import pytest
+
+from models import db, User, Post
+
+
+@pytest.fixture(scope='module')
+def post_id(app):
+    with app.app_context():
+        user = User(username='fieldsets', email='fieldsets@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        post = Post(title='Поля', content='Зміст', user_id=user.id)
+        db.session.add(post)
+        db.session.commit()
+        return post.id
+
+
+@pytest.mark.parametrize('query', ['', '?fields=id,author', '?include=author', '?fields=id,author&include=author'])
+def test_author_is_always_a_name(client, post_id, query):
+    post = client.get(f'/api/posts/{post_id}' + query).get_json()
+    if 'author' in post:
+        assert post['author'] == 'fieldsets'
+    if 'include=author' in query:
+        assert post['author_info'] == {'id': post['author_info']['id'], 'username': 'fieldsets'}
+    else:
+        assert 'author_info' not in post
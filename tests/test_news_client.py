@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import news_client
+from news_client import NewsClient, CircuitBreaker, CircuitOpen, UpstreamError
+
+
+class Clock:
+    """Керований time.monotonic для news_client (event loop лишається на справжньому)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class Upstream:
+    """Локальне джерело новин: статус і затримку відповіді змінює тест"""
+
+    def __init__(self):
+        self.status = 200
+        self.delay = 0
+        self.requests = 0
+        self.version = 0
+        self.app = web.Application()
+        self.app.router.add_get('/news', self.news)
+
+    async def news(self, request):
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.json_response({'error': 'down'}, status=self.status)
+        limit = int(request.query['_limit'])
+        return web.json_response([{'id': i, 'version': self.version} for i in range(limit)])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(news_client, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def run(scenario, **options):
+    """Виконати scenario(client, upstream) з клієнтом, під'єднаним до локального джерела"""
+    async def main():
+        upstream = Upstream()
+        async with TestServer(upstream.app) as server:
+            client = NewsClient(str(server.make_url('/news')), limit=3, **options)
+            await client.start()
+            try:
+                await scenario(client, upstream)
+            finally:
+                await client.close()
+
+    asyncio.run(main())
+
+
+def test_breaker_opens_after_failures_and_closes_after_probe(clock):
+    async def scenario(client, upstream):
+        upstream.status = 500
+        for _ in range(3):
+            with pytest.raises(UpstreamError):
+                await client.get()
+        assert client.breaker.state == 'open'
+
+        # Розімкнений запобіжник не звертається до джерела
+        with pytest.raises(CircuitOpen) as error:
+            await client.get()
+        assert upstream.requests == 3
+        assert error.value.retry_after == 10
+
+        # Після паузи — одна пробна спроба; помилка знову розмикає
+        clock.now += 10
+        assert client.breaker.state == 'half_open'
+        with pytest.raises(UpstreamError):
+            await client.get()
+        assert client.breaker.state == 'open'
+        assert upstream.requests == 4
+
+        # Успішна проба замикає
+        clock.now += 10
+        upstream.status = 200
+        news, stale = await client.get()
+        assert (len(news), stale) == (3, False)
+        assert client.breaker.state == 'closed'
+        assert client.breaker.failures == 0
+
+    run(scenario, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=10))
+
+
+def test_half_open_admits_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_cancelled_probe_does_not_stick_half_open(clock):
+    async def scenario(client, upstream):
+        upstream.status = 500
+        with pytest.raises(UpstreamError):
+            await client.get()
+        clock.now += 10
+
+        upstream.status, upstream.delay = 200, 5
+        probe = client.refresh()
+        while not upstream.requests > 1:
+            await asyncio.sleep(0.01)
+        assert client.breaker.probing
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert not client.breaker.probing
+
+        upstream.delay = 0
+        news, _ = await client.get()
+        assert len(news) == 3
+        assert client.breaker.state == 'closed'
+
+    run(scenario, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10))
+
+
+def test_stale_while_revalidate(clock):
+    async def scenario(client, upstream):
+        news, stale = await client.get()
+        assert stale is False
+        assert news[0]['version'] == 0
+
+        # Свіжий кеш — без звернення до джерела
+        clock.now += 59
+        assert await client.get() == (news, False)
+        assert upstream.requests == 1
+
+        # Застарілий кеш віддається одразу, оновлення йде у фоні
+        upstream.version = 1
+        clock.now += 2
+        stale_news, stale = await client.get()
+        assert (stale_news, stale) == (news, True)
+        await client.refreshing
+        assert upstream.requests == 2
+
+        fresh, stale = await client.get()
+        assert (fresh[0]['version'], stale) == (1, False)
+
+        # Джерело лежить — поки не минув stale_ttl, клієнти отримують застарілу копію
+        upstream.status = 500
+        clock.now += 61
+        assert await client.get() == (fresh, True)
+        with pytest.raises(UpstreamError):
+            await client.refreshing
+        assert await client.get() == (fresh, True)
+
+        # Після stale_ttl віддати нічого
+        clock.now += 600
+        with pytest.raises(UpstreamError):
+            await client.get()
+        assert client.stats['stale_hits'] == 3
+
+    run(scenario, ttl=60, stale_ttl=600)
@@ -0,0 +1,73 @@
+import pytest
+
+import api
+from models import db, User, Post, Comment, ListVersion
+from query_budget import QueryBudgetExceeded
+
+
+@pytest.fixture(scope='module')
+def post_ids(app):
+    """Кілька авторів, постів і коментарів: N+1 дав би запит на кожен рядок"""
+    with app.app_context():
+        users = [User(username=f'budget{i}', email=f'budget{i}@example.com', password_hash='x') for i in range(5)]
+        db.session.add_all(users)
+        db.session.flush()
+
+        posts = [Post(title=f'Пост {i}', content='Зміст', user_id=users[i % 5].id) for i in range(10)]
+        db.session.add_all(posts)
+        db.session.flush()
+
+        db.session.add_all(
+            Comment(content=f'Коментар {i}', post_id=posts[0].id, user_id=users[i % 5].id) for i in range(5)
+        )
+        ListVersion.bump('posts')
+        db.session.commit()
+        return [post.id for post in posts]
+
+
+@pytest.fixture
+def without_eager_loading(monkeypatch):
+    """Регресія: запит постів без joinedload/selectinload/undefer — зв'язки добираються по одному"""
+    monkeypatch.setattr(api, 'post_query', lambda fields, include: Post.query)
+
+
+def test_budgets_are_declared():
+    assert api.PostListAPI.get.query_budget == 3
+    assert api.PostAPI.get.query_budget == 3
+
+
+@pytest.mark.parametrize('query', ['', '?include=author', '?fields=id,author,comments_count'])
+def test_post_list_within_budget(client, post_ids, query):
+    response = client.get('/api/posts' + query)
+    assert response.status_code == 200
+    assert set(post_ids) <= {post['id'] for post in response.get_json()['posts']}
+
+
+@pytest.mark.parametrize('query', ['', '?include=author,comments'])
+def test_post_within_budget(client, post_ids, query):
+    response = client.get(f'/api/posts/{post_ids[0]}' + query)
+    assert response.status_code == 200
+    assert len(response.get_json()['comments']) == 5
+
+
+def test_post_list_n_plus_one_fails(client, post_ids, without_eager_loading):
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/api/posts')
+
+
+def test_post_n_plus_one_fails(client, post_ids, without_eager_loading):
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f'/api/posts/{post_ids[0]}')
+
+
+def test_not_enforced_outside_tests(app, client, post_ids, without_eager_loading):
+    app.testing = False
+    try:
+        assert client.get('/api/posts').status_code == 200
+
+        # Поза тестовим режимом виняток стає звичайною 500
+        app.config['QUERY_BUDGET_ENFORCE'] = True
+        assert client.get('/api/posts').status_code == 500
+    finally:
+        app.testing = True
+        app.config['QUERY_BUDGET_ENFORCE'] = False
@@ -0,0 +1,117 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from config import Config
+from models import db, User, Post
+from replicas import replica_router, replica_reads, STICKY_COOKIE
+
+
+@pytest.fixture
+def router_app(tmp_path):
+    """Primary та дві репліки — окремі файли SQLite; replica2 відстає на хвилину"""
+    state = dict(replica_router.__dict__)
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path}/primary.sqlite',
+        SQLALCHEMY_BINDS={},
+        DATABASE_REPLICA_URLS=f'sqlite:///{tmp_path}/replica1.sqlite,sqlite:///{tmp_path}/replica2.sqlite',
+        REPLICA_MAX_LAG=5,
+        REPLICA_CHECK_INTERVAL=0,
+        REPLICA_STICKY_SECONDS=10
+    )
+    replica_router.init_app(app)
+    db.init_app(app)
+
+    @app.get('/posts')
+    @replica_reads
+    def read_posts():
+        # Заголовок показує, з якої бази прочитано
+        return {'source': db.session.scalar(db.select(Post.title).order_by(Post.id))}
+
+    @app.post('/posts')
+    @replica_reads
+    def write_post():
+        db.session.add(Post(title='new', content='new', user_id=1))
+        db.session.commit()
+        return {'source': db.session.scalar(db.select(Post.title).order_by(Post.id))}
+
+    now = datetime.utcnow()
+    updated = {None: now - timedelta(seconds=60), 'replica1': now - timedelta(seconds=60),
+               'replica2': now - timedelta(seconds=120)}
+    with app.app_context():
+        for key, updated_at in updated.items():
+            engine = db.engines[key]
+            db.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(db.insert(User), [{'id': 1, 'username': 'u', 'email': 'u@example.com',
+                                                'password_hash': 'x', 'created_at': now}])
+                conn.execute(db.insert(Post), [{'id': 1, 'title': key or 'primary', 'content': '',
+                                                'user_id': 1, 'created_at': now, 'updated_at': updated_at}])
+
+    yield app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    replica_router.__dict__.update(state)
+
+
+def sources(client, count=10):
+    return {client.get('/posts').get_json()['source'] for _ in range(count)}
+
+
+def test_lagging_replica_is_out_of_rotation(router_app):
+    client = router_app.test_client()
+    assert sources(client) == {'replica1'}
+
+    health = replica_router.stats()['replicas']
+    assert health['replica1']['healthy'] and health['replica1']['lag'] == 0
+    assert not health['replica2']['healthy'] and health['replica2']['lag'] >= 60
+    assert (health['replica1']['reads'], health['replica2']['reads']) == (10, 0)
+
+
+def test_replica_returns_after_catching_up(router_app):
+    client = router_app.test_client()
+    with router_app.app_context():
+        primary_updated = db.session.scalar(db.select(Post.updated_at))
+        with db.engines['replica2'].begin() as conn:
+            conn.execute(db.update(Post).values(updated_at=primary_updated))
+
+    assert sources(client, 40) == {'replica1', 'replica2'}
+    assert replica_router.stats()['replicas']['replica2']['healthy']
+
+
+def test_all_replicas_lagging_reads_primary(router_app):
+    client = router_app.test_client()
+    with router_app.app_context():
+        with db.engines[None].begin() as conn:
+            conn.execute(db.update(Post).values(updated_at=datetime.utcnow() - timedelta(seconds=30)))
+
+    assert sources(client) == {'primary'}
+
+
+def test_reads_stick_to_primary_after_write(router_app):
+    client = router_app.test_client()
+    assert sources(client, 1) == {'replica1'}
+
+    # Запит із записом читає з primary і ставить куку
+    response = client.post('/posts')
+    assert response.get_json()['source'] == 'primary'
+    sticky_until = float(client.get_cookie(STICKY_COOKIE).value)
+    assert 0 < sticky_until - time.time() <= 11
+
+    # Поки кука діє, клієнт бачить власні записи
+    assert sources(client) == {'primary'}
+
+    # Інший клієнт без куки читає з репліки
+    assert sources(router_app.test_client()) == {'replica1'}
+
+    # Кука прострочена — знову репліки
+    client.set_cookie(STICKY_COOKIE, str(int(time.time()) - 1))
+    assert sources(client) == {'replica1'}
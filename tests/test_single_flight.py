@@ -0,0 +1,26 @@
+import asyncio
+
+from single_flight import SingleFlight
+from sql_timing import start_request, current_timings
+
+
+def test_shared_task_does_not_inherit_leader_timings():
+    async def main():
+        flight = SingleFlight()
+        seen = []
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            seen.append(current_timings.get())
+            return 'body'
+
+        async def request():
+            # Як sql_timing_middleware: статистика на час запиту
+            start_request(slow_ms=100)
+            return await flight.run('posts', produce)
+
+        assert await asyncio.gather(request(), request()) == ['body', 'body']
+        assert seen == [None]
+        assert flight.stats['leaders'] == 1 and flight.stats['collapsed'] == 1
+
+    asyncio.run(main())